@@ -9,35 +9,55 @@ TapResult.
 from __future__ import annotations
 
 import sqlite3
+import threading
+import time
 from dataclasses import dataclass, field
-from datetime import date, datetime
+from datetime import date
 from enum import Enum, auto
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 import models.attendance_model as attendance_model
 import models.student_model as student_model
 import models.section_model as section_model
 import models.session_model as session_model
+import models.settings_model as settings_model
+from models.database import get_connection, transaction
+from utils.google_credentials import load_credentials
 from utils.logger import log_info, log_error, log_warning
 
 # ── Locale-independent weekday helper ─────────────────────────────────────────
-_ENGLISH_DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday',
-                 'Friday', 'Saturday', 'Sunday']
-_ENGLISH_MONTHS = ['January', 'February', 'March', 'April', 'May', 'June',
-                   'July', 'August', 'September', 'October', 'November', 'December']
+_ENGLISH_DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday',
+                 'Friday', 'Saturday', 'Sunday')
+_ENGLISH_MONTHS = ('January', 'February', 'March', 'April', 'May', 'June',
+                   'July', 'August', 'September', 'October', 'November', 'December')
 
+# (date, 'YYYY-MM-DD', English weekday) for the current local day; rebuilt
+# by _today() the first time it is called after midnight.
+_today_cache: Optional[tuple[date, str, str]] = None
 
-def _english_weekday(dt: datetime) -> str:
+
+def _english_weekday(dt: date) -> str:
     """Return English weekday name regardless of OS locale."""
     return _ENGLISH_DAYS[dt.weekday()]
 
 
-def _english_month(dt: datetime) -> str:
+def _english_month(dt: date) -> str:
     """Return English month name regardless of OS locale."""
     return _ENGLISH_MONTHS[dt.month - 1]
 
 
+def _today() -> tuple[str, str]:
+    """Return (ISO date, English weekday) for today, formatted once per day."""
+    global _today_cache
+    today = date.today()
+    cached = _today_cache
+    if cached is None or cached[0] != today:
+        cached = _today_cache = (today, today.isoformat(), _ENGLISH_DAYS[today.weekday()])
+    return cached[1], cached[2]
+
+
 class TapResultType(Enum):
     """Describes the outcome of a card tap so the view can display the right feedback."""
     KNOWN_PRESENT   = auto()   # Known student → marked Present (Green flash)
@@ -48,7 +68,7 @@ class TapResultType(Enum):
     ERROR           = auto()   # Unexpected error (show dialog)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TapResult:
     """Return value from process_card_tap(); carries all info the view needs."""
     result_type: TapResultType
@@ -77,8 +97,9 @@ def process_card_tap(card_id: str, session_id: Optional[int]) -> TapResult:
     Returns:
         A TapResult describing what happened.
     """
+    # str.strip() hands back the same object when there is nothing to strip,
+    # so the usual clean reader value costs no allocation here.
     card_id = card_id.strip()
-
     if not card_id:
         return TapResult(
             result_type=TapResultType.ERROR,
@@ -94,23 +115,23 @@ def process_card_tap(card_id: str, session_id: Optional[int]) -> TapResult:
         )
 
     try:
-        student = student_model.get_student_by_card_id(card_id)
+        student = student_model.get_cached_student_by_card_id(card_id)
 
         if student is None:
-            log_info(f"Unknown card tap: '{card_id}'")
+            log_info("Unknown card tap: '%s'", card_id)
             return TapResult(
                 result_type=TapResultType.UNKNOWN_CARD,
                 card_id=card_id,
                 message="Unregistered card — please complete registration.",
             )
 
-        student_id: int = student["id"]
-        first_name: str = student["first_name"]
-        last_name: str  = student["last_name"]
+        student_id, first_name, last_name = student.id, student.first_name, student.last_name
 
-        if attendance_model.is_duplicate_tap(session_id, student_id):
+        # Insert and duplicate check in one statement: None means a record
+        # already exists for this session.
+        if attendance_model.mark_present(session_id, student_id, method="RFID") is None:
             log_warning(
-                f"Duplicate tap: student_id={student_id} session_id={session_id}"
+                "Duplicate tap: student_id=%s session_id=%s", student_id, session_id
             )
             return TapResult(
                 result_type=TapResultType.DUPLICATE_TAP,
@@ -121,10 +142,9 @@ def process_card_tap(card_id: str, session_id: Optional[int]) -> TapResult:
                 message=f"{first_name} {last_name} is already marked present.",
             )
 
-        attendance_model.mark_present(session_id, student_id, method="RFID")
         log_info(
-            f"Card tap OK: card='{card_id}' student_id={student_id} "
-            f"name='{first_name} {last_name}' session={session_id}"
+            "Card tap OK: card='%s' student_id=%s name='%s %s' session=%s",
+            card_id, student_id, first_name, last_name, session_id,
         )
         return TapResult(
             result_type=TapResultType.KNOWN_PRESENT,
@@ -136,7 +156,7 @@ def process_card_tap(card_id: str, session_id: Optional[int]) -> TapResult:
         )
 
     except sqlite3.Error as exc:
-        log_error(f"DB error in process_card_tap: {exc}")
+        log_error("DB error in process_card_tap: %s", exc)
         return TapResult(
             result_type=TapResultType.ERROR,
             card_id=card_id,
@@ -158,11 +178,11 @@ def record_attendance_after_registration(
     try:
         attendance_model.mark_present(session_id, student_id, method="RFID")
         log_info(
-            f"Post-registration attendance: session={session_id} student={student_id}"
+            "Post-registration attendance: session=%s student=%s", session_id, student_id
         )
         return True
     except sqlite3.Error as exc:
-        log_error(f"DB error in record_attendance_after_registration: {exc}")
+        log_error("DB error in record_attendance_after_registration: %s", exc)
         return False
 
 
@@ -183,22 +203,14 @@ def mark_present_manual(session_id: int, student_id: int) -> tuple[bool, str]:
         (False, error_msg)    on failure.
     """
     try:
-        existing = attendance_model.get_attendance_record(session_id, student_id)
-        if existing is None:
-            # No record yet — insert as Present/Manual
-            attendance_model.mark_present(session_id, student_id, method="Manual")
-            log_info(
-                f"Manual mark-present: session={session_id} student={student_id} (new record)"
-            )
-        elif existing["status"] == "Absent":
-            attendance_model.toggle_status(session_id, student_id)
+        if attendance_model.set_status_atomic(session_id, student_id, "Present"):
             log_info(
-                f"Manual mark-present (toggle): session={session_id} student={student_id}"
+                "Manual mark-present: session=%s student=%s", session_id, student_id
             )
         # else already Present — nothing to do
         return True, ""
     except sqlite3.Error as exc:
-        log_error(f"DB error in mark_present_manual: {exc}")
+        log_error("DB error in mark_present_manual: %s", exc)
         return False, f"Database error: {exc}"
 
 
@@ -212,15 +224,16 @@ def toggle_attendance(session_id: int, student_id: int) -> Optional[str]:
     try:
         new_status = attendance_model.toggle_status(session_id, student_id)
         log_info(
-            f"Manual toggle: session={session_id} student={student_id} → {new_status}"
+            "Manual toggle: session=%s student=%s → %s",
+            session_id, student_id, new_status,
         )
         return new_status
     except (sqlite3.Error, ValueError) as exc:
-        log_error(f"Error toggling attendance: {exc}")
+        log_error("Error toggling attendance: %s", exc)
         return None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PassiveTapResult:
     """Result from process_rfid_passive(); carries all info the Attendance view needs."""
     result_type: TapResultType
@@ -262,53 +275,52 @@ def process_rfid_passive(card_id: str) -> PassiveTapResult:
         )
 
     try:
-        student = student_model.get_student_by_card_id(card_id)
+        student = student_model.get_cached_student_by_card_id(card_id)
         if student is None:
-            log_info(f"Passive tap — unknown card: '{card_id}'")
+            log_info("Passive tap — unknown card: '%s'", card_id)
             return PassiveTapResult(
                 result_type=TapResultType.UNKNOWN_CARD,
                 card_id=card_id,
                 message="Unregistered card — please register the student.",
             )
 
-        student_id: int  = student["id"]
-        first_name: str  = student["first_name"]
-        last_name: str   = student["last_name"]
-        is_inactive: bool = bool(student["is_inactive"])
-
-        # ── Check if student has ANY sections enrolled at all ─────────────────────
-        all_enrolled = student_model.get_sections_for_student(student_id)
-        if not all_enrolled:
-            attended, total_sessions = attendance_model.get_student_attendance_summary(student_id)
-            log_info(
-                f"Passive tap — no sections: student_id={student_id} "
-                f"({first_name} {last_name})"
-            )
-            return PassiveTapResult(
-                result_type=TapResultType.NO_SECTIONS,
-                card_id=card_id,
-                student_id=student_id,
-                first_name=first_name,
-                last_name=last_name,
-                is_inactive=is_inactive,
-                attended=attended,
-                total_sessions=total_sessions,
-                message=(
-                    f"{first_name} {last_name} has no sections assigned. "
-                    "Please select their sections."
-                ),
-            )
+        student_id, first_name, last_name, is_inactive = student
 
-        today_date: str = date.today().isoformat()           # 'YYYY-MM-DD'
-        today_day: str  = _english_weekday(datetime.now())   # 'Monday' … 'Sunday'
+        today_date, today_day = _today()    # 'YYYY-MM-DD', 'Monday' … 'Sunday'
 
-        sections_today = section_model.get_sections_for_student_on_day(student_id, today_day)
+        sections_today = section_model.get_sections_for_students_on_day(
+            today_day
+        ).get(student_id, [])
 
         if not sections_today:
+            # Only a student with nothing today needs the full enrolment
+            # check, so the usual tap skips that query.
+            all_enrolled = student_model.get_sections_for_student(student_id)
+            if not all_enrolled:
+                attended, total_sessions = attendance_model.get_student_attendance_summary(student_id)
+                log_info(
+                    "Passive tap — no sections: student_id=%s (%s %s)",
+                    student_id, first_name, last_name,
+                )
+                return PassiveTapResult(
+                    result_type=TapResultType.NO_SECTIONS,
+                    card_id=card_id,
+                    student_id=student_id,
+                    first_name=first_name,
+                    last_name=last_name,
+                    is_inactive=is_inactive,
+                    attended=attended,
+                    total_sessions=total_sessions,
+                    message=(
+                        f"{first_name} {last_name} has no sections assigned. "
+                        "Please select their sections."
+                    ),
+                )
+
             attended, total_sessions = attendance_model.get_student_attendance_summary(student_id)
             log_info(
-                f"Passive tap: student_id={student_id} ({first_name} {last_name}) — "
-                f"no sections scheduled on {today_day}."
+                "Passive tap: student_id=%s (%s %s) — no sections scheduled on %s.",
+                student_id, first_name, last_name, today_day,
             )
             return PassiveTapResult(
                 result_type=TapResultType.KNOWN_PRESENT,
@@ -323,26 +335,26 @@ def process_rfid_passive(card_id: str) -> PassiveTapResult:
                 message=f"{first_name} {last_name} — no sections today ({today_day}).",
             )
 
-        newly_marked: list[str] = []
-        already_marked: list[str] = []
-
-        for sec in sections_today:
-            session_id = session_model.get_or_create_session(sec["id"], today_date)
-            existing = attendance_model.get_attendance_record(session_id, student_id)
-            if existing is None:
-                attendance_model.mark_present(session_id, student_id, method="RFID")
-                newly_marked.append(sec["name"])
-            elif existing["status"] == "Absent":
-                # Override manual Absent → Present on RFID scan
-                attendance_model.toggle_status(session_id, student_id)
-                newly_marked.append(sec["name"])
-            else:
-                already_marked.append(sec["name"])
+        # Auto-create sessions and mark Present (overriding a manual
+        # Absent) for every section in one batched upsert.  Only these
+        # writes take the write lock, so lookups and read-only outcomes
+        # (unknown card, nothing today) never wait on another writer.
+        sec_names = {sec.id: sec.name for sec in sections_today}
+        with transaction():
+            marked_ids, already_ids = attendance_model.mark_present_in_sections(
+                student_id, list(sec_names), today_date, method="RFID"
+            )
+            if marked_ids:
+                # Student just attended — re-evaluate inactive status (may
+                # become active again); committed together with the marks.
+                is_inactive = _refresh_inactive_status_for(student_id, is_inactive)
+        newly_marked: list[str] = [sec_names[i] for i in marked_ids]
+        already_marked: list[str] = [sec_names[i] for i in already_ids]
 
         if newly_marked:
             log_info(
-                f"Passive tap OK: student_id={student_id} "
-                f"sections_marked={newly_marked}"
+                "Passive tap OK: student_id=%s sections_marked=%s",
+                student_id, newly_marked,
             )
             result_type = TapResultType.KNOWN_PRESENT
             # Re-fetch summary AFTER marking so the count reflects this tap
@@ -351,14 +363,10 @@ def process_rfid_passive(card_id: str) -> PassiveTapResult:
                 f"{first_name} {last_name} — present: {', '.join(newly_marked)} "
                 f"| {attended_now}/{total_now} sessions"
             )
-            # Student just attended — re-evaluate inactive status (may become active again)
-            _refresh_inactive_status_for(student_id)
-            _refreshed = student_model.get_student_by_id(student_id)
-            is_inactive = bool(_refreshed["is_inactive"]) if _refreshed is not None else False
         else:
             log_info(
-                f"Passive tap duplicate: student_id={student_id} "
-                f"all sections already marked={already_marked}"
+                "Passive tap duplicate: student_id=%s all sections already marked=%s",
+                student_id, already_marked,
             )
             result_type = TapResultType.DUPLICATE_TAP
             attended_now, total_now = attendance_model.get_student_attendance_summary(student_id)
@@ -382,7 +390,7 @@ def process_rfid_passive(card_id: str) -> PassiveTapResult:
         )
 
     except sqlite3.Error as exc:
-        log_error(f"DB error in process_rfid_passive: {exc}")
+        log_error("DB error in process_rfid_passive: %s", exc)
         return PassiveTapResult(
             result_type=TapResultType.ERROR,
             card_id=card_id,
@@ -400,6 +408,8 @@ def mark_present_for_enrolled_sections(
 
     A session is auto-created for each section if one does not yet exist.
     Sections where the student is already marked are silently skipped.
+    All sections are written in one batched transaction, so a DB error
+    leaves none of them marked.
 
     Args:
         student_id:  The newly created student id.
@@ -408,51 +418,74 @@ def mark_present_for_enrolled_sections(
     Returns:
         List of section ids (as strings) that were successfully marked Present.
     """
-    today = date.today().isoformat()
-    marked: list[str] = []
-    for sec_id in section_ids:
-        try:
-            session_id = session_model.get_or_create_session(sec_id, today)
-            existing = attendance_model.get_attendance_record(session_id, student_id)
-            if existing is None:
-                attendance_model.mark_present(session_id, student_id, method="RFID")
-                marked.append(str(sec_id))
-            elif existing["status"] == "Absent":
-                attendance_model.toggle_status(session_id, student_id)
-                marked.append(str(sec_id))
-            # else: already Present — skip
-            log_info(
-                f"Post-registration mark-present: student={student_id} "
-                f"section={sec_id} session={session_id}"
-            )
-        except sqlite3.Error as exc:
-            log_error(
-                f"DB error marking post-registration attendance: "
-                f"student={student_id} section={sec_id} — {exc}"
-            )
-    return marked
+    today, _weekday = _today()
+    try:
+        marked_ids, _already = attendance_model.mark_present_in_sections(
+            student_id, list(section_ids), today, method="RFID"
+        )
+    except sqlite3.Error as exc:
+        log_error(
+            "DB error marking post-registration attendance: student=%s sections=%s — %s",
+            student_id, section_ids, exc,
+        )
+        return []
+    log_info(
+        "Post-registration mark-present: student=%s sections=%s marked=%s",
+        student_id, section_ids, marked_ids,
+    )
+    return [str(sec_id) for sec_id in marked_ids]
+
+
+def warm_up_tap_path() -> None:
+    """
+    Run the queries of the RFID tap path once with dummy keys.
+
+    The connection keeps up to 256 compiled statements keyed by their exact
+    SQL text, so this compiles the hot statements (and pulls the relevant
+    index pages into the page cache) at startup instead of on the first
+    real tap.  The inactive-flag UPDATE is run for a student id that
+    cannot exist, so it matches no rows.  Call once after
+    initialise_database().
+    """
+    _today_date, today_day = _today()
+    try:
+        student_model.get_cached_student_by_card_id("")
+        student_model.get_sections_for_student(-1)
+        section_model.get_sections_for_students_on_day(today_day)
+        attendance_model.get_student_attendance_summary(-1)
+        threshold = int(settings_model.get_setting("inactive_threshold") or 3)
+        attendance_model.apply_inactive_threshold(threshold, -1)
+    except sqlite3.Error as exc:
+        log_warning("Tap-path warm-up failed: %s", exc)
 
 
 # ── Inactive-student helpers ──────────────────────────────────────────────────
 
-def _refresh_inactive_status_for(student_id: int) -> None:
+def _refresh_inactive_status_for(student_id: int, is_inactive: bool) -> bool:
     """
     Re-evaluate a single student's inactive flag based on their consecutive
     absences versus the ``inactive_threshold`` setting.
     Call this after any attendance change that could affect the student.
+
+    Args:
+        student_id:  The student to re-evaluate.
+        is_inactive: Their flag before this call (as held by the caller).
+
+    Returns:
+        The student's ``is_inactive`` flag after the update.
     """
-    import models.settings_model as _sm
-    threshold = int(_sm.get_setting("inactive_threshold") or 3)
-    consec = attendance_model.get_consecutive_recent_absences(student_id)
-    should_be_inactive = consec >= threshold
-    current = student_model.get_student_by_id(student_id)
-    if current is not None and bool(current["is_inactive"]) != should_be_inactive:
-        student_model.set_inactive_status(student_id, should_be_inactive)
-        log_info(
-            f"Student id={student_id} marked "
-            f"{'inactive' if should_be_inactive else 'active'} "
-            f"(consecutive absences: {consec}, threshold: {threshold})"
-        )
+    threshold = int(settings_model.get_setting("inactive_threshold") or 3)
+    became_inactive, became_active = attendance_model.apply_inactive_threshold(
+        threshold, student_id
+    )
+    if not (became_inactive or became_active):
+        return is_inactive
+    student_model.invalidate_card_cache()
+    log_info(
+        "Student id=%s marked %s (threshold: %s)",
+        student_id, "inactive" if became_inactive else "active", threshold,
+    )
+    return bool(became_inactive)
 
 
 def refresh_inactive_status_all() -> tuple[int, int]:
@@ -462,25 +495,13 @@ def refresh_inactive_status_all() -> tuple[int, int]:
     Returns:
         (newly_inactive_count, newly_active_count) — number of status changes made.
     """
-    import models.settings_model as _sm
-    threshold = int(_sm.get_setting("inactive_threshold") or 3)
-    students = student_model.get_all_students()
-    became_inactive = 0
-    became_active = 0
-    for stu in students:
-        sid = stu["id"]
-        consec = attendance_model.get_consecutive_recent_absences(sid)
-        should = consec >= threshold
-        currently = bool(stu["is_inactive"])
-        if currently != should:
-            student_model.set_inactive_status(sid, should)
-            if should:
-                became_inactive += 1
-            else:
-                became_active += 1
+    threshold = int(settings_model.get_setting("inactive_threshold") or 3)
+    became_inactive, became_active = attendance_model.apply_inactive_threshold(threshold)
+    if became_inactive or became_active:
+        student_model.invalidate_card_cache()
     log_info(
-        f"refresh_inactive_status_all: +{became_inactive} inactive, "
-        f"+{became_active} re-activated (threshold={threshold})"
+        "refresh_inactive_status_all: +%s inactive, +%s re-activated (threshold=%s)",
+        became_inactive, became_active, threshold,
     )
     return became_inactive, became_active
 
@@ -496,78 +517,73 @@ def get_daily_report(date_str: str) -> dict:
         total_active  — distinct active students enrolled in any section today
         present_count — of those, how many were marked Present in at least one section
         absent_count  — total_active - present_count
-        sections      — list of dicts {name, present, absent, total}
+        sections      — list of dicts {name, present, absent, total}, by name
     """
-    from models.database import get_connection as _gc
     try:
-        today_day = _english_weekday(datetime.strptime(date_str, "%Y-%m-%d"))
+        today_day = _english_weekday(date.fromisoformat(date_str))
     except ValueError:
         today_day = ""
 
-    with _gc() as conn:
-        # Active students enrolled in sections whose day matches today
-        enrolled_rows = conn.execute(
-            """
-            SELECT DISTINCT s.id,
-                            sec.id   AS sec_id,
-                            sec.name AS sec_name
-            FROM   students s
-            JOIN   student_sections ss ON ss.student_id  = s.id
-            JOIN   sections         sec ON sec.id         = ss.section_id
-            WHERE  sec.day      = ?
-              AND  s.is_inactive = 0;
-            """,
-            (today_day,),
-        ).fetchall()
-
-        # Present records today (any section)
-        present_rows = conn.execute(
+    with get_connection() as conn:
+        # Per (active student, section scheduled that weekday): was the
+        # student Present in that section on date_str?  Aggregated per
+        # section in SQL; the two scalar subqueries give the distinct-student
+        # totals (a student enrolled in two sections counts once).
+        # Plain tuples: every column is unpacked positionally below, so the
+        # name lookups of sqlite3.Row buy nothing here.
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        section_rows = cursor.execute(
             """
-            SELECT DISTINCT a.student_id,
-                            sec.id AS sec_id
-            FROM   attendance a
-            JOIN   sessions sess ON sess.id   = a.session_id
-            JOIN   sections sec  ON sec.id    = sess.section_id
-            WHERE  sess.date  = ?
-              AND  a.status   = 'Present';
+            WITH enrolled AS (
+                SELECT ss.student_id,
+                       sec.id   AS sec_id,
+                       sec.name AS sec_name,
+                       EXISTS (
+                           SELECT 1
+                           FROM   sessions   sess
+                           JOIN   attendance a ON a.session_id = sess.id
+                           WHERE  sess.date       = ?
+                             AND  sess.section_id = sec.id
+                             AND  a.student_id    = ss.student_id
+                             AND  a.status        = 'Present'
+                       ) AS is_present
+                FROM   sections         sec
+                JOIN   student_sections ss ON ss.section_id = sec.id
+                JOIN   students         s  ON s.id          = ss.student_id
+                WHERE  sec.day       = ?
+                  AND  s.is_inactive = 0
+            )
+            SELECT sec_id,
+                   sec_name,
+                   COUNT(*)        AS total,
+                   SUM(is_present) AS present,
+                   (SELECT COUNT(DISTINCT student_id) FROM enrolled) AS total_active,
+                   (SELECT COUNT(DISTINCT student_id) FROM enrolled
+                    WHERE  is_present)                               AS present_count
+            FROM   enrolled
+            GROUP  BY sec_id
+            ORDER  BY sec_name;
             """,
-            (date_str,),
+            (date_str, today_day),
         ).fetchall()
 
-    present_set: set[tuple[int, int]] = {
-        (r["student_id"], r["sec_id"]) for r in present_rows
-    }
-
-    sec_data: dict[int, dict] = {}
-    total_active_students: set[int] = set()
-    present_students: set[int] = set()
-
-    for row in enrolled_rows:
-        sid    = row["id"]
-        sec_id = row["sec_id"]
-        total_active_students.add(sid)
-        if sec_id not in sec_data:
-            sec_data[sec_id] = {
-                "name": row["sec_name"],
-                "present": 0,
-                "absent": 0,
-                "total": 0,
-            }
-        sec_data[sec_id]["total"] += 1
-        if (sid, sec_id) in present_set:
-            present_students.add(sid)
-            sec_data[sec_id]["present"] += 1
-        else:
-            sec_data[sec_id]["absent"] += 1
-
-    total   = len(total_active_students)
-    present = len(present_students)
+    sections: list[dict] = [
+        {
+            "name":    sec_name,
+            "present": sec_present,
+            "absent":  sec_total - sec_present,
+            "total":   sec_total,
+        }
+        for _sec_id, sec_name, sec_total, sec_present, _ta, _pc in section_rows
+    ]
+    total, present = section_rows[0][4:6] if section_rows else (0, 0)
     return {
         "date":          date_str,
         "total_active":  total,
         "present_count": present,
         "absent_count":  total - present,
-        "sections":      list(sec_data.values()),
+        "sections":      sections,
     }
 
 
@@ -580,25 +596,17 @@ def get_student_attendance_overview(student_id: int, date_str: str) -> list[dict
         session_id (None if no session exists on date_str),
         status ('Present', 'Absent', or None if no record).
     """
-    sections = student_model.get_sections_for_student(student_id)
-    result: list[dict] = []
-    for sec in sections:
-        session = session_model.get_existing_session_for_date(sec["id"], date_str)
-        session_id: Optional[int] = session["id"] if session else None
-        status: Optional[str] = None
-        if session_id is not None:
-            record = attendance_model.get_attendance_record(session_id, student_id)
-            if record:
-                status = record["status"]
-        result.append({
-            "section_id":   sec["id"],
-            "section_name": sec["name"],
-            "day":          sec["day"],
-            "time":         sec["time"] if sec["time"] else "",
-            "session_id":   session_id,
-            "status":       status,
-        })
-    return result
+    return [
+        {
+            "section_id":   row["section_id"],
+            "section_name": row["section_name"],
+            "day":          row["day"],
+            "time":         row["time"] if row["time"] else "",
+            "session_id":   row["session_id"],
+            "status":       row["status"],
+        }
+        for row in attendance_model.get_overview_rows(student_id, date_str)
+    ]
 
 
 def set_student_attendance(
@@ -613,23 +621,17 @@ def set_student_attendance(
         (False, error_message) on failure.
     """
     try:
-        session_id = session_model.get_or_create_session(section_id, date_str)
-        record = attendance_model.get_attendance_record(session_id, student_id)
-        if record is None:
-            if target_status == "Present":
-                attendance_model.mark_present(session_id, student_id, method="Manual")
-            else:
-                attendance_model.mark_absent(session_id, student_id, method="Manual")
-        elif record["status"] != target_status:
-            attendance_model.toggle_status(session_id, student_id)
-        # else: already correct status — no-op
+        # Session lookup/creation and the attendance write commit together.
+        with transaction():
+            session_id = session_model.get_or_create_session(section_id, date_str)
+            attendance_model.set_status_atomic(session_id, student_id, target_status)
         log_info(
-            f"Manual attendance set: student={student_id} section={section_id} "
-            f"date={date_str} status={target_status}"
+            "Manual attendance set: student=%s section=%s date=%s status=%s",
+            student_id, section_id, date_str, target_status,
         )
         return True, ""
     except sqlite3.Error as exc:
-        log_error(f"DB error in set_student_attendance: {exc}")
+        log_error("DB error in set_student_attendance: %s", exc)
         return False, f"Database error: {exc}"
 
 
@@ -647,12 +649,121 @@ def get_today_log() -> list[dict]:
         A list of dicts as produced by
         ``attendance_model.get_today_attendance_with_details()``.
     """
-    return attendance_model.get_today_attendance_with_details(
-        date.today().isoformat()
-    )
+    return attendance_model.get_today_attendance_with_details(_today()[0])
+
+
+
+
+_SHEETS_SCOPES = (
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+)
+
+# (credentials path, credentials mtime, spreadsheet URL) → opened Spreadsheet.
+# Reusing the handle skips re-reading the key file, re-authorising and
+# re-opening the spreadsheet on every push.
+_spreadsheet_cache: dict[tuple[str, float, str], object] = {}
+_spreadsheet_cache_lock = threading.Lock()
+
+
+def _open_spreadsheet(creds_path: str, spreadsheet_url: str):
+    """Return an authorised gspread Spreadsheet, cached per credentials file."""
+    import gspread  # type: ignore[import]
+
+    key = (creds_path, Path(creds_path).stat().st_mtime, spreadsheet_url)
+    with _spreadsheet_cache_lock:
+        sh = _spreadsheet_cache.get(key)
+        if sh is None:
+            creds = load_credentials(creds_path, _SHEETS_SCOPES)
+            sh = gspread.authorize(creds).open_by_url(spreadsheet_url)
+            # Drop handles opened with an older copy of the key file.
+            for old in [k for k in _spreadsheet_cache if k[2] == spreadsheet_url]:
+                del _spreadsheet_cache[old]
+            _spreadsheet_cache[key] = sh
+    return sh
+
+
+def _forget_spreadsheet(spreadsheet_url: str) -> None:
+    """Evict cached handles for *spreadsheet_url* (e.g. after an auth error)."""
+    with _spreadsheet_cache_lock:
+        for key in [k for k in _spreadsheet_cache if k[2] == spreadsheet_url]:
+            del _spreadsheet_cache[key]
+
+
+# Back-off delays (seconds) between retries of a rate-limited / failed write.
+_SHEETS_RETRY_DELAYS = (0.25, 0.5, 1, 2, 4, 8, 16, 32)
+_SHEETS_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _http_status(exc: Exception) -> Optional[int]:
+    """Return the HTTP status carried by a gspread APIError, if any."""
+    return getattr(getattr(exc, "response", None), "status_code", None)
+
+
+def _with_retry(fn, *args, **kwargs):
+    """Call a gspread method, retrying quota (429) and transient 5xx errors.
+
+    Only for idempotent requests: a timeout or 5xx may still have been
+    applied server-side, so the call must be safe to repeat.  Waits through
+    _SHEETS_RETRY_DELAYS between attempts; any other error, or a failure on
+    the final attempt, propagates to the caller.
+    """
+    from gspread.exceptions import APIError  # type: ignore[import]
+
+    for delay in _SHEETS_RETRY_DELAYS:
+        try:
+            return fn(*args, **kwargs)
+        except APIError as exc:
+            status = _http_status(exc)
+            if status not in _SHEETS_RETRY_STATUSES:
+                raise
+            log_warning("Sheets API returned %s; retrying in %ss", status, delay)
+            time.sleep(delay)
+    return fn(*args, **kwargs)
+
 
+# Maximum rows sent per Sheets batchUpdate request.
+_SHEETS_CHUNK_ROWS = 5000
 
 
+def _resize_request(sheet_id: int, rows: int, cols: int) -> dict:
+    """batchUpdate request setting a worksheet's grid to *rows* x *cols*."""
+    return {
+        "updateSheetProperties": {
+            "properties": {
+                "sheetId": sheet_id,
+                "gridProperties": {"rowCount": rows, "columnCount": cols},
+            },
+            "fields": "gridProperties(rowCount,columnCount)",
+        }
+    }
+
+
+def _update_cells_request(sheet_id: int, start_row: int, rows: list[list[str]]) -> dict:
+    """batchUpdate request writing *rows* as plain strings from (start_row, A)."""
+    return {
+        "updateCells": {
+            "start": {"sheetId": sheet_id, "rowIndex": start_row, "columnIndex": 0},
+            "rows": [
+                {"values": [{"userEnteredValue": {"stringValue": v}} for v in row]}
+                for row in rows
+            ],
+            "fields": "userEnteredValue",
+        }
+    }
+
+
+def _summary_rows(
+    cumulative: list[tuple],
+    section_names: list[str],
+    student_section_map: dict[int, dict[str, str]],
+) -> Iterator[list[str]]:
+    """Yield one summary-sheet row per student (without the header)."""
+    for sid, *row_data in cumulative:
+        sec_map = student_section_map.get(sid, {})
+        row_data.extend([sec_map.get(sname, "0/0") for sname in section_names])
+        yield row_data
+
 
 def push_summary_to_sheets(spreadsheet_url: str) -> tuple[bool, str]:
     """
@@ -677,89 +788,79 @@ def push_summary_to_sheets(spreadsheet_url: str) -> tuple[bool, str]:
     """
     try:
         import gspread  # type: ignore[import]
-        from google.oauth2.service_account import Credentials  # type: ignore[import]
+        import google.oauth2.service_account  # type: ignore[import]  # noqa: F401
     except ImportError as exc:
         return False, f"gspread / google-auth not installed: {exc}"
 
-    import models.settings_model as settings_model
-
     creds_path = settings_model.get_setting("google_credentials_path") or ""
     if not creds_path or not Path(creds_path).is_file():
         return False, "Credentials not configured"
 
     try:
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
-        gc = gspread.authorize(creds)
-        sh = gc.open_by_url(spreadsheet_url)
+        # ── Gather data ──────────────────────────────────────────────────
+        # Rows arrive already in export shape (see get_*_summary_rows).
+        cumulative = attendance_model.get_student_summary_rows()
+
+        # One pass over the per-section rows collects the section columns (in
+        # order of first appearance) and indexes student_id → {section: summary}
+        section_columns: dict[str, None] = {}
+        student_section_map: dict[int, dict[str, str]] = {}
+        for sid, sname, summary in attendance_model.get_section_summary_rows():
+            section_columns[sname] = None
+            student_section_map.setdefault(sid, {})[sname] = summary
+        section_names_ordered = list(section_columns)
+    except sqlite3.Error as exc:
+        log_error("push_summary_to_sheets: %s", exc)
+        return False, str(exc)
+
+    # ── Build header ─────────────────────────────────────────────────────
+    header = ["First Name", "Last Name", "Card ID", "Total Attendance"]
+    for sname in section_names_ordered:
+        header.append(sname)
+
+    try:
+        sh = _open_spreadsheet(creds_path, spreadsheet_url)
     except Exception as exc:
-        log_error(f"push_summary_to_sheets: failed to open spreadsheet: {exc}")
+        log_error("push_summary_to_sheets: failed to open spreadsheet: %s", exc)
         return False, str(exc)
 
     try:
+        # Size the worksheet to exactly header + one row per student.  The
+        # rows written below then cover every cell of the grid, so no
+        # separate clear request is needed and no implicit expansion occurs.
+        needed_rows = len(cumulative) + 1
+        needed_cols = len(header)
         try:
             ws = sh.worksheet("Attendance Summary")
         except gspread.exceptions.WorksheetNotFound:
-            ws = sh.add_worksheet(title="Attendance Summary", rows=1000, cols=50)
-
-        ws.clear()
-
-        # ── Gather data ──────────────────────────────────────────────────
-        cumulative = attendance_model.get_total_attendance_per_student()
-        per_section = attendance_model.get_per_section_attendance_per_student()
-
-        # Build an ordered list of unique section names for dynamic columns
-        section_names_ordered: list[str] = []
-        section_names_set: set[str] = set()
-        for row in per_section:
-            sname = row["section_name"]
-            if sname not in section_names_set:
-                section_names_set.add(sname)
-                section_names_ordered.append(sname)
-
-        # Index per-section data by student_id → {section_name: summary}
-        student_section_map: dict[int, dict[str, str]] = {}
-        for row in per_section:
-            sid = row["student_id"]
-            if sid not in student_section_map:
-                student_section_map[sid] = {}
-            student_section_map[sid][row["section_name"]] = row["summary"]
-
-        # ── Build header ─────────────────────────────────────────────────
-        header = ["First Name", "Last Name", "Card ID", "Total Attendance"]
-        for sname in section_names_ordered:
-            header.append(sname)
-
-        # ── Build rows ───────────────────────────────────────────────────
-        rows_out = [header]
-        for student in cumulative:
-            row_data = [
-                student.get("first_name", ""),
-                student.get("last_name", ""),
-                student.get("card_id") or "",
-                student.get("summary", "0/0"),
-            ]
-            sid = student.get("id")
-            sec_map = student_section_map.get(sid, {})
-            for sname in section_names_ordered:
-                row_data.append(sec_map.get(sname, "0/0"))
-            rows_out.append(row_data)
-
-        # Ensure worksheet has enough columns
-        needed_cols = len(header)
-        if ws.col_count < needed_cols:
-            ws.resize(cols=needed_cols)
-
-        ws.update(rows_out, "A1")
+            # Not retried: a failed-looking add may still have created the
+            # sheet, and repeating it would fail with "already exists".
+            ws = sh.add_worksheet(
+                title="Attendance Summary", rows=needed_rows, cols=needed_cols,
+            )
+        # The resize (when needed) rides in the same spreadsheets.batchUpdate
+        # as the first chunk of rows.  Rows are streamed in bounded chunks so
+        # the full sheet is never held in memory at once.
+        requests: list[dict] = []
+        if (ws.row_count, ws.col_count) != (needed_rows, needed_cols):
+            requests.append(_resize_request(ws.id, needed_rows, needed_cols))
+        rows = _summary_rows(cumulative, section_names_ordered, student_section_map)
+        start_row = 0
+        chunk = [header, *islice(rows, _SHEETS_CHUNK_ROWS - 1)]
+        while chunk:
+            requests.append(_update_cells_request(ws.id, start_row, chunk))
+            _with_retry(sh.batch_update, {"requests": requests})
+            requests = []
+            start_row += len(chunk)
+            chunk = list(islice(rows, _SHEETS_CHUNK_ROWS))
         info = (
             f"Pushed {len(cumulative)} students with "
             f"{len(section_names_ordered)} section columns to Attendance Summary"
         )
-        log_info(f"push_summary_to_sheets: {info}")
+        log_info("push_summary_to_sheets: %s", info)
         return True, info
     except Exception as exc:
-        log_error(f"push_summary_to_sheets: {exc}")
+        if _http_status(exc) in (401, 403):
+            _forget_spreadsheet(spreadsheet_url)
+        log_error("push_summary_to_sheets: %s", exc)
         return False, str(exc)
@@ -29,6 +29,7 @@ from typing import Optional
 import models.student_model as student_model
 import models.settings_model as settings_model
 from models.database import transaction
+from utils.google_credentials import load_credentials
 from utils.logger import log_info, log_error, log_warning
 from utils.localization import turkish_lower
 
@@ -37,7 +38,7 @@ from utils.localization import turkish_lower
 # Data structures
 # ──────────────────────────────────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class ImportStudentRow:
     """One student parsed from the Google Sheet."""
     first_name: str
@@ -78,6 +79,139 @@ class ImportPreview:
 # Preview
 # ──────────────────────────────────────────────────────────────────────────────
 
+_READONLY_SCOPES = (
+    "https://www.googleapis.com/auth/spreadsheets.readonly",
+    "https://www.googleapis.com/auth/drive.readonly",
+)
+
+
+# Every column of the first *visible* tab (ZZZ is the Sheets column limit);
+# the API clamps the range to the tab's grid.  Hidden tabs are skipped, so a
+# workbook whose first tab is hidden imports the next visible one.
+_FIRST_TAB_RANGE = "A:ZZZ"
+
+# D_ cell values (after strip) that do not count as attended.
+_NOT_ATTENDED = frozenset(("", "0"))
+
+# Spreadsheet id → (Drive modifiedTime, first tab title, cell grid) of the
+# last sheet previewed.
+_sheet_cache: dict[str, tuple[str, str, list[list[str]]]] = {}
+
+# Set once Drive answers 403/404 (the Drive API is not enabled for the
+# service account, or it cannot see the file); later previews skip the request.
+_drive_unavailable = False
+
+
+def _drive_modified_time(http, spreadsheet_id: str) -> Optional[str]:
+    """Return the sheet's Drive modifiedTime, or None if it can't be read.
+
+    Best effort: without Drive access the preview still works, it just never
+    reuses cached cells.  A 403/404 is logged once and Drive is not asked
+    again; other failures (timeouts, 5xx) only affect this preview.
+    """
+    global _drive_unavailable
+    if _drive_unavailable:
+        return None
+    try:
+        return http.get_file_drive_metadata(spreadsheet_id).get("modifiedTime")
+    except Exception as exc:  # noqa: BLE001
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+        _drive_unavailable = status in (403, 404)
+        log_warning(f"import_controller: Drive modifiedTime unavailable — {exc}")
+        return None
+
+
+def _sheet_title_from_range(a1_range: str) -> str:
+    """Return the tab title from an A1 range such as ``'It''s'!A1:C9``."""
+    title = a1_range.rpartition("!")[0]
+    if len(title) >= 2 and title[0] == title[-1] == "'":
+        title = title[1:-1].replace("''", "'")
+    return title
+
+
+def _parse_sheet_values(
+    values: list[list[str]],
+    threshold: int,
+) -> tuple[list[ImportStudentRow], int]:
+    """
+    Parse the cell grid of the legacy sheet (header row first).
+
+    Columns are resolved once from the header (case-insensitive) and every
+    data row is then read by position.
+
+    Returns:
+        (students, session_count) — session_count is the number of D_ columns.
+
+    Raises:
+        ValueError: With a user-facing message if the sheet has no data rows
+                    or no usable name column.
+    """
+    if len(values) < 2:
+        raise ValueError("The sheet appears to be empty (no data rows found).")
+
+    rows = iter(values)
+    # Normalise header names to lowercase-stripped for case-insensitive lookup
+    header = [h.strip().lower() for h in next(rows)]
+    date_cols = [
+        i for i, h in enumerate(header) if h.startswith("d_") and len(h) >= 8
+    ]
+
+    # Determine name columns
+    has_split_names = "first_name" in header and "last_name" in header
+    if has_split_names:
+        first_idx = header.index("first_name")
+        last_idx  = header.index("last_name")
+    elif "name" in header:
+        name_idx = header.index("name")
+    else:
+        raise ValueError(
+            "Sheet must contain a 'name' column  OR  both 'first_name' and "
+            "'last_name' columns."
+        )
+
+    # Find the rfid column (case-insensitive)
+    rfid_idx: Optional[int] = header.index("rfid") if "rfid" in header else None
+
+    parsed: list[ImportStudentRow] = []
+    for row in rows:
+        # Parse name
+        if has_split_names:
+            first = row[first_idx].strip()
+            last  = row[last_idx].strip()
+        else:
+            parts = row[name_idx].strip().split(None, 1)
+            first = parts[0] if parts else ""
+            last  = parts[1] if len(parts) > 1 else ""
+
+        if not first and not last:
+            continue  # skip blank rows
+
+        # Parse rfid
+        card_raw = row[rfid_idx].strip() if rfid_idx is not None else ""
+        card_id: Optional[str] = card_raw if card_raw else None
+
+        # Count sessions attended (plain loop: no generator frame per row)
+        att_count = 0
+        for i in date_cols:
+            if row[i].strip() not in _NOT_ATTENDED:
+                att_count += 1
+
+        # Apply filter rule: only include students meeting the threshold
+        include = att_count >= threshold
+
+        parsed.append(
+            ImportStudentRow(
+                first_name=first,
+                last_name=last,
+                card_id=card_id,
+                attendance_count=att_count,
+                include=include,
+            )
+        )
+
+    return parsed, len(date_cols)
+
+
 def preview_import(
     sheet_url: str,
     threshold: int,
@@ -87,6 +221,8 @@ def preview_import(
     Connect to the Google Sheet, parse rows, and return a preview without
     writing anything to the local database.
 
+    The first visible tab is read; a hidden first tab is skipped.
+
     Args:
         sheet_url:        Full URL or share link for the Google Sheet.
         threshold:        Minimum attendance count; students below this AND
@@ -111,13 +247,8 @@ def preview_import(
     # ── Connect to Google Sheets ──────────────────────────────────────────────
     try:
         import gspread
-        from google.oauth2.service_account import Credentials
 
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets.readonly",
-            "https://www.googleapis.com/auth/drive.readonly",
-        ]
-        creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
+        creds = load_credentials(creds_path, _READONLY_SCOPES)
         gc = gspread.authorize(creds)
     except FileNotFoundError:
         return None, f"Credentials file not found:\n{creds_path}"
@@ -126,10 +257,11 @@ def preview_import(
         return None, f"Could not load credentials:\n{exc}"
 
     # ── Open the spreadsheet ──────────────────────────────────────────────────
+    # The first tab is read directly; going through gc.open_by_url(...).sheet1
+    # would fetch the spreadsheet metadata twice before reading any values.
+    http = gc.http_client
     try:
-        spreadsheet = gc.open_by_url(sheet_url)
-        ws = spreadsheet.sheet1
-        sheet_title = ws.title
+        spreadsheet_id = gspread.utils.extract_id_from_url(sheet_url)
     except Exception as exc:  # noqa: BLE001
         log_error(f"import_controller: could not open sheet — {exc}")
         return None, (
@@ -138,81 +270,52 @@ def preview_import(
             f"Error: {exc}"
         )
 
-    # ── Parse rows ────────────────────────────────────────────────────────────
-    try:
-        records = ws.get_all_records(default_blank="")
-    except Exception as exc:  # noqa: BLE001
-        log_error(f"import_controller: could not read records — {exc}")
-        return None, f"Could not read sheet data:\n{exc}"
-
-    if not records:
-        return None, "The sheet appears to be empty (no data rows found)."
-
-    # Normalise header names to lowercase-stripped for case-insensitive lookup
-    sample_keys = [k.strip().lower() for k in records[0].keys()] if records else []
-    date_col_keys = [
-        k for k in records[0].keys()
-        if k.strip().lower().startswith("d_") and len(k.strip()) >= 8
-    ]
-
-    # Determine name columns
-    has_split_names = (
-        "first_name" in sample_keys and "last_name" in sample_keys
-    )
-    has_full_name = "name" in sample_keys
-    if not has_split_names and not has_full_name:
-        return None, (
-            "Sheet must contain a 'name' column  OR  both 'first_name' and "
-            "'last_name' columns."
-        )
-
-    # Find the rfid column (case-insensitive)
-    rfid_key: Optional[str] = next(
-        (k for k in records[0].keys() if k.strip().lower() == "rfid"),
-        None,
-    )
-
-    parsed: list[ImportStudentRow] = []
-    for row in records:
-        # Parse name
-        if has_split_names:
-            first = str(row.get("first_name", "")).strip()
-            last  = str(row.get("last_name",  "")).strip()
-        else:
-            full = str(row.get("name", "")).strip()
-            parts = full.split(None, 1)
-            first = parts[0] if parts else ""
-            last  = parts[1] if len(parts) > 1 else ""
-
-        if not first and not last:
-            continue  # skip blank rows
-
-        # Parse rfid
-        card_raw = str(row.get(rfid_key, "")).strip() if rfid_key else ""
-        card_id: Optional[str] = card_raw if card_raw else None
-
-        # Count sessions attended
-        att_count = sum(
-            1 for col in date_col_keys
-            if str(row.get(col, "")).strip() not in ("", "0")
-        )
-
-        # Apply filter rule: only include students meeting the threshold
-        include = att_count >= threshold
-
-        parsed.append(
-            ImportStudentRow(
-                first_name=first,
-                last_name=last,
-                card_id=card_id,
-                attendance_count=att_count,
-                include=include,
+    # Re-previews (e.g. with another threshold) reuse the cells fetched last
+    # time as long as Drive reports the same modification time.  The time is
+    # read before the cells, so cached cells are never older than it.
+    modified_time = _drive_modified_time(http, spreadsheet_id)
+    cached = _sheet_cache.get(spreadsheet_id)
+    if cached is not None and modified_time is not None and cached[0] == modified_time:
+        _modified, sheet_title, values = cached
+        log_info(f"Import preview: reusing cached cells of '{sheet_title}'")
+    else:
+        # ── Read every cell in one request ────────────────────────────────────
+        # A range without a sheet name refers to the first visible tab, and the
+        # response echoes the range qualified with that tab's title, so no
+        # separate metadata request is needed.  Formatted cell strings (so no
+        # str() casts are needed when parsing), padded to a rectangle as
+        # get_all_values() would do; get_all_records() would also build a
+        # dict per row and numericise.
+        try:
+            response = http.values_get(
+                spreadsheet_id,
+                _FIRST_TAB_RANGE,
+                params={"valueRenderOption": "FORMATTED_VALUE"},
             )
-        )
+        except Exception as exc:  # noqa: BLE001
+            log_error(f"import_controller: could not open sheet — {exc}")
+            return None, (
+                f"Could not open the Google Sheet.\n\n"
+                f"Check the URL and that the service account has 'Viewer' access.\n\n"
+                f"Error: {exc}"
+            )
+        sheet_title = _sheet_title_from_range(response.get("range", ""))
+        values = gspread.utils.fill_gaps(response.get("values", []))
+
+        _sheet_cache.clear()        # keep only the most recent sheet
+        if modified_time is not None:
+            _sheet_cache[spreadsheet_id] = (modified_time, sheet_title, values)
 
-    with_rfid    = sum(1 for r in parsed if r.card_id)
+    try:
+        parsed, session_count = _parse_sheet_values(values, threshold)
+    except ValueError as exc:
+        return None, str(exc)
+
+    with_rfid = will_import = 0
+    for r in parsed:
+        with_rfid   += r.card_id is not None
+        will_import += r.include
     without_rfid = len(parsed) - with_rfid
-    will_import  = sum(1 for r in parsed if r.include)
     will_skip    = len(parsed) - will_import
 
     log_info(
@@ -225,7 +328,7 @@ def preview_import(
         total_rows=len(parsed),
         with_rfid=with_rfid,
         without_rfid=without_rfid,
-        session_count=len(date_col_keys),
+        session_count=session_count,
         will_import=will_import,
         will_skip=will_skip,
         students=parsed,
@@ -258,60 +361,61 @@ def commit_import(preview: ImportPreview) -> tuple[int, int, str]:
         return 0, 0, ""
 
     # ── Pre-fetch existing data ONCE (C2) ──────────────────────────────────────
-    existing_all = student_model.get_all_students()
+    existing_all = student_model.get_name_and_card_rows()
     known_names: set[tuple[str, str]] = {
-        (turkish_lower(s["first_name"]), turkish_lower(s["last_name"]))
-        for s in existing_all
-    }
-    known_cards: set[str] = {
-        s["card_id"] for s in existing_all if s["card_id"]
+        (turkish_lower(first), turkish_lower(last))
+        for first, last, _card in existing_all
     }
+    known_cards: set[str] = {card for _f, _l, card in existing_all if card}
+
+    skipped = 0
+
+    # Rows are filtered in Python first (the checks only read the in-memory
+    # sets), then inserted with one executemany() inside a single atomic
+    # transaction (C3).  All rows of one import share a created_at stamp.
+    created_at = datetime.now(timezone.utc).isoformat()
+    to_insert: list[tuple[str, str, Optional[str], str]] = []
+    for row in to_import:
+        name_key = (turkish_lower(row.first_name), turkish_lower(row.last_name))
+
+        if name_key in known_names:
+            log_warning(
+                f"Import skip (name exists): "
+                f"'{row.first_name} {row.last_name}'"
+            )
+            skipped += 1
+            continue
+
+        if row.card_id and row.card_id in known_cards:
+            log_warning(
+                f"Import skip (card taken): "
+                f"'{row.first_name} {row.last_name}' card='{row.card_id}'"
+            )
+            skipped += 1
+            continue
 
-    imported = 0
-    skipped  = 0
+        to_insert.append((row.first_name, row.last_name, row.card_id, created_at))
+
+        # Update in-memory sets so later rows in the same batch see the
+        # student queued above (avoids inserting duplicates within a single
+        # import run).
+        known_names.add(name_key)
+        if row.card_id:
+            known_cards.add(row.card_id)
 
-    # ── Atomic transaction for all writes (C3) ──────────────────────────────
     # Raw SQL is used here because all writes must share one connection for
-    # true atomicity — calling student_model.create_student() would open its
-    # own connection, breaking the transaction boundary.
+    # true atomicity — calling student_model.create_student() per row would
+    # also prepare and dispatch one statement per student.
     try:
         with transaction() as conn:
-            for row in to_import:
-                name_key = (turkish_lower(row.first_name), turkish_lower(row.last_name))
-
-                if name_key in known_names:
-                    log_warning(
-                        f"Import skip (name exists): "
-                        f"'{row.first_name} {row.last_name}'"
-                    )
-                    skipped += 1
-                    continue
-
-                if row.card_id and row.card_id in known_cards:
-                    log_warning(
-                        f"Import skip (card taken): "
-                        f"'{row.first_name} {row.last_name}' card='{row.card_id}'"
-                    )
-                    skipped += 1
-                    continue
-
-                created_at = datetime.now(timezone.utc).isoformat()
-                conn.execute(
-                    """
-                    INSERT INTO students (first_name, last_name, card_id, created_at)
-                    VALUES (?, ?, ?, ?);
-                    """,
-                    (row.first_name, row.last_name, row.card_id, created_at),
-                )
-
-                # Update in-memory sets so later rows in the same batch see
-                # the newly inserted student (avoids inserting duplicates
-                # within a single import run).
-                known_names.add(name_key)
-                if row.card_id:
-                    known_cards.add(row.card_id)
-                imported += 1
-
+            conn.executemany(
+                """
+                INSERT INTO students (first_name, last_name, card_id, created_at)
+                VALUES (?, ?, ?, ?);
+                """,
+                to_insert,
+            )
+        imported = len(to_insert)
     except sqlite3.Error as exc:
         log_error(f"import_controller: DB error during commit — {exc}")
         return 0, 0, f"Database error during import (rolled back):\n{exc}"
@@ -319,5 +423,7 @@ def commit_import(preview: ImportPreview) -> tuple[int, int, str]:
         log_error(f"import_controller: unexpected error during commit — {exc}")
         return 0, 0, f"Unexpected error (rolled back):\n{exc}"
 
+    if imported:
+        student_model.invalidate_card_cache()
     log_info(f"Import committed: imported={imported} skipped={skipped}")
     return imported, skipped, ""
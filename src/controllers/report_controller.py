@@ -11,9 +11,11 @@ from __future__ import annotations
 import io
 import os
 import sqlite3
-from datetime import datetime
+from collections import Counter
+from datetime import date, datetime
 from pathlib import Path
-from typing import Optional
+from itertools import groupby
+from typing import Any, Iterable, Iterator, Optional
 
 import models.attendance_model as attendance_model
 import models.section_model as section_model
@@ -80,6 +82,126 @@ def _register_unicode_fonts():
         log_error(f"Failed to register Unicode font: {exc}")
 
 
+# ── Shared PDF styles (built once per process) ────────────────────────────────
+_PDF_STYLES: Optional[dict] = None
+
+
+def _get_pdf_styles() -> dict:
+    """Return the fonts and ParagraphStyles shared by both PDF reports.
+
+    Importing ReportLab and building the sample stylesheet is the slow part
+    of an export, so it happens on the first export only and later exports
+    reuse the cached styles.  Fonts are registered first so the styles pick
+    up UniFont when it is available.
+    """
+    global _PDF_STYLES
+    if _PDF_STYLES is not None:
+        return _PDF_STYLES
+
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    _register_unicode_fonts()
+    font_name = "UniFont" if _FONT_REGISTERED else "Helvetica"
+    font_name_bold = "UniFont-Bold" if _FONT_REGISTERED else "Helvetica-Bold"
+
+    styles = getSampleStyleSheet()
+    header_blue = colors.HexColor("#1e40af")
+    header_navy = colors.HexColor("#0f4c75")
+    zebra_rows = [colors.white, colors.HexColor("#f8f9fa")]
+    _PDF_STYLES = {
+        "font": font_name,
+        "font_bold": font_name_bold,
+        "title": ParagraphStyle(
+            "ReportTitle", parent=styles["Title"],
+            fontName=font_name_bold, fontSize=18, spaceAfter=6,
+        ),
+        "subtitle": ParagraphStyle(
+            "ReportSubtitle", parent=styles["Normal"],
+            fontName=font_name, fontSize=11, textColor=colors.grey, spaceAfter=12,
+        ),
+        "heading": ParagraphStyle(
+            "ReportHeading", parent=styles["Heading2"],
+            fontName=font_name_bold, fontSize=13, spaceAfter=8,
+        ),
+        "cell": ParagraphStyle(
+            "CellWrap", parent=styles["Normal"],
+            fontName=font_name, fontSize=7, leading=9,
+        ),
+        "footer": ParagraphStyle(
+            "Footer", parent=styles["Normal"],
+            fontName=font_name, fontSize=8, textColor=colors.grey,
+        ),
+        # Status text colours
+        "good": colors.HexColor("#166534"),
+        "warn": colors.HexColor("#92400e"),
+        "bad": colors.HexColor("#991b1b"),
+        # Base TableStyle commands; callers append per-cell colouring.
+        "daily_summary_cmds": (
+            ("BACKGROUND", (0, 0), (-1, 0), header_blue),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+            ("FONTNAME", (0, 0), (-1, 0), font_name_bold),
+            ("FONTNAME", (0, 1), (-1, -1), font_name),
+            ("FONTSIZE", (0, 0), (-1, -1), 10),
+            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.HexColor("#f0f4ff")]),
+        ),
+        "daily_student_cmds": (
+            ("BACKGROUND", (0, 0), (-1, 0), header_navy),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+            ("FONTNAME", (0, 0), (-1, 0), font_name_bold),
+            ("FONTNAME", (0, 1), (-1, -1), font_name),
+            ("FONTSIZE", (0, 0), (-1, -1), 9),
+            ("ALIGN", (0, 0), (0, -1), "CENTER"),
+            ("ALIGN", (4, 0), (4, -1), "CENTER"),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ("ROWBACKGROUNDS", (0, 1), (-1, -1), zebra_rows),
+        ),
+        "full_summary_cmds": (
+            ("BACKGROUND", (0, 0), (-1, 0), header_blue),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+            ("FONTNAME", (0, 0), (-1, 0), font_name_bold),
+            ("FONTNAME", (0, 1), (-1, -1), font_name),
+            ("FONTSIZE", (0, 0), (-1, -1), 9),
+            ("ALIGN", (0, 0), (0, -1), "CENTER"),
+            ("ALIGN", (3, 0), (-1, -1), "CENTER"),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ("ROWBACKGROUNDS", (0, 1), (-1, -1), zebra_rows),
+        ),
+        "grid_cmds": (
+            ("BACKGROUND", (0, 0), (-1, 0), header_navy),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+            ("FONTNAME", (0, 0), (-1, 0), font_name_bold),
+            ("FONTNAME", (0, 1), (-1, -1), font_name),
+            ("FONTSIZE", (0, 0), (-1, 0), 7),
+            ("FONTSIZE", (0, 1), (-1, -1), 8),
+            ("ALIGN", (1, 0), (-1, -1), "CENTER"),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ("ROWBACKGROUNDS", (0, 1), (-1, -1), zebra_rows),
+        ),
+    }
+    return _PDF_STYLES
+
+
+def _runs(values: Iterable, start: int = 1) -> Iterator[tuple[int, int, Any]]:
+    """Yield (first, last, value) for each run of equal adjacent *values*.
+
+    Indices count from *start*, so a run can be styled with a single
+    TableStyle range command instead of one command per cell.
+    """
+    first = start
+    for value, group in groupby(values):
+        last = first + sum(1 for _ in group) - 1
+        yield first, last, value
+        first = last + 1
+
+
+# Attendance-grid cell text per status; anything else renders as "—".
+_GRID_MARKS = {"Present": "✓", "Absent": "✗"}
+
+
 # ── Locale-independent weekday helper (shared with attendance_controller) ─────
 _ENGLISH_DAYS = [
     "Monday", "Tuesday", "Wednesday", "Thursday",
@@ -89,8 +211,14 @@ _ENGLISH_DAYS = [
 
 def _english_weekday_from_date(date_str: str) -> str:
     """Return English weekday name for an ISO date string 'YYYY-MM-DD'."""
-    dt = datetime.strptime(date_str, "%Y-%m-%d")
-    return _ENGLISH_DAYS[dt.weekday()]
+    return _ENGLISH_DAYS[date.fromisoformat(date_str).weekday()]
+
+
+def _short_date(date_str: str) -> str:
+    """Return 'MM/DD' for an ISO date string by slicing (no date parsing)."""
+    if len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-":
+        return f"{date_str[5:7]}/{date_str[8:]}"
+    return date_str[-5:]
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -115,18 +243,23 @@ def get_daily_section_report(section_id: int, date_str: str) -> dict:
     weekday = _english_weekday_from_date(date_str)
     rows = attendance_model.get_section_attendance_on_date(section_id, date_str)
 
-    present = sum(1 for r in rows if r["status"] == "Present")
-    absent = sum(1 for r in rows if r["status"] == "Absent")
-    no_record = sum(1 for r in rows if r["status"] is None)
-
+    # One pass: tally statuses while building the student list
+    present = absent = no_record = 0
     students = []
     for r in rows:
+        status = r["status"]
+        if status == "Present":
+            present += 1
+        elif status == "Absent":
+            absent += 1
+        elif status is None:
+            no_record += 1
         students.append({
             "student_id": r["student_id"],
             "first_name": r["first_name"],
             "last_name": r["last_name"],
             "card_id": r["card_id"],
-            "status": r["status"] or "No Record",
+            "status": status or "No Record",
         })
 
     return {
@@ -185,12 +318,13 @@ def get_full_section_report(section_id: int) -> dict:
         if r["session_date"] is not None:
             students_map[sid]["records"][r["session_date"]] = r["status"] or "No Record"
 
-    # Compute summaries per student
+    # Compute summaries per student (one counting pass over each record map)
+    total_sessions = len(session_dates)
     students = []
     for stu in students_map.values():
-        total_present = sum(1 for s in stu["records"].values() if s == "Present")
-        total_absent = sum(1 for s in stu["records"].values() if s == "Absent")
-        total_sessions = len(session_dates)
+        counts = Counter(stu["records"].values())
+        total_present = counts["Present"]
+        total_absent = counts["Absent"]
         pct = f"{total_present / total_sessions * 100:.0f}%" if total_sessions > 0 else "N/A"
         stu["total_present"] = total_present
         stu["total_absent"] = total_absent
@@ -227,35 +361,20 @@ def generate_daily_section_pdf(report: dict, output_path: str) -> str:
         The output_path on success.
     """
     from reportlab.lib.pagesizes import A4
-    from reportlab.lib import colors
     from reportlab.lib.units import mm
     from reportlab.platypus import (
-        SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer,
+        SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer,
     )
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 
-    _register_unicode_fonts()
-    font_name = "UniFont" if _FONT_REGISTERED else "Helvetica"
-    font_name_bold = "UniFont-Bold" if _FONT_REGISTERED else "Helvetica-Bold"
+    pdf_styles = _get_pdf_styles()
+    title_style = pdf_styles["title"]
+    subtitle_style = pdf_styles["subtitle"]
+    heading_style = pdf_styles["heading"]
 
     doc = SimpleDocTemplate(output_path, pagesize=A4,
                             leftMargin=20*mm, rightMargin=20*mm,
                             topMargin=20*mm, bottomMargin=20*mm)
 
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        "ReportTitle", parent=styles["Title"],
-        fontName=font_name_bold, fontSize=18, spaceAfter=6,
-    )
-    subtitle_style = ParagraphStyle(
-        "ReportSubtitle", parent=styles["Normal"],
-        fontName=font_name, fontSize=11, textColor=colors.grey, spaceAfter=12,
-    )
-    heading_style = ParagraphStyle(
-        "ReportHeading", parent=styles["Heading2"],
-        fontName=font_name_bold, fontSize=13, spaceAfter=8,
-    )
-
     elements = []
 
     # Title
@@ -280,16 +399,7 @@ def generate_daily_section_pdf(report: dict, output_path: str) -> str:
         [str(total), str(present), str(absent), str(no_rec), pct],
     ]
     summary_table = Table(summary_data, colWidths=[90, 70, 70, 80, 100])
-    summary_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1e40af")),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-        ("FONTNAME", (0, 0), (-1, 0), font_name_bold),
-        ("FONTNAME", (0, 1), (-1, -1), font_name),
-        ("FONTSIZE", (0, 0), (-1, -1), 10),
-        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.HexColor("#f0f4ff")]),
-    ]))
+    summary_table.setStyle(TableStyle(pdf_styles["daily_summary_cmds"]))
     elements.append(summary_table)
     elements.append(Spacer(1, 8*mm))
 
@@ -297,40 +407,24 @@ def generate_daily_section_pdf(report: dict, output_path: str) -> str:
     elements.append(Paragraph("Student Details", heading_style))
 
     table_data = [["#", "First Name", "Last Name", "Card ID", "Status"]]
-    for i, stu in enumerate(report["students"], 1):
-        table_data.append([
-            str(i),
-            stu["first_name"],
-            stu["last_name"],
-            stu["card_id"] or "—",
-            stu["status"],
-        ])
+    table_data += [
+        [str(i), stu["first_name"], stu["last_name"], stu["card_id"] or "—", stu["status"]]
+        for i, stu in enumerate(report["students"], 1)
+    ]
 
     col_widths = [30, 120, 120, 100, 80]
-    student_table = Table(table_data, colWidths=col_widths)
-    student_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#0f4c75")),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-        ("FONTNAME", (0, 0), (-1, 0), font_name_bold),
-        ("FONTNAME", (0, 1), (-1, -1), font_name),
-        ("FONTSIZE", (0, 0), (-1, -1), 9),
-        ("ALIGN", (0, 0), (0, -1), "CENTER"),
-        ("ALIGN", (4, 0), (4, -1), "CENTER"),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-        ("ROWBACKGROUNDS", (0, 1), (-1, -1),
-         [colors.white, colors.HexColor("#f8f9fa")]),
-    ]))
-
-    # Colour-code status cells
-    for i, stu in enumerate(report["students"], 1):
-        if stu["status"] == "Present":
-            student_table.setStyle(TableStyle([
-                ("TEXTCOLOR", (4, i), (4, i), colors.HexColor("#166534")),
-            ]))
-        elif stu["status"] == "Absent":
-            student_table.setStyle(TableStyle([
-                ("TEXTCOLOR", (4, i), (4, i), colors.HexColor("#991b1b")),
-            ]))
+    # One row per student — may span pages, so use LongTable and repeat the header
+    student_table = LongTable(table_data, colWidths=col_widths, repeatRows=1)
+
+    # Colour-code status cells; applied with the base style in one setStyle
+    status_colors = {"Present": pdf_styles["good"], "Absent": pdf_styles["bad"]}
+    style_cmds = list(pdf_styles["daily_student_cmds"])
+    style_cmds.extend(
+        ("TEXTCOLOR", (4, first), (4, last), status_colors[status])
+        for first, last, status in _runs(stu["status"] for stu in report["students"])
+        if status in status_colors
+    )
+    student_table.setStyle(TableStyle(style_cmds))
 
     elements.append(student_table)
     elements.append(Spacer(1, 10*mm))
@@ -338,8 +432,7 @@ def generate_daily_section_pdf(report: dict, output_path: str) -> str:
     # Footer
     elements.append(Paragraph(
         f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-        ParagraphStyle("Footer", parent=styles["Normal"],
-                       fontName=font_name, fontSize=8, textColor=colors.grey),
+        pdf_styles["footer"],
     ))
 
     doc.build(elements)
@@ -364,40 +457,23 @@ def generate_full_section_pdf(report: dict, output_path: str) -> str:
         The output_path on success.
     """
     from reportlab.lib.pagesizes import A4, landscape
-    from reportlab.lib import colors
     from reportlab.lib.units import mm
     from reportlab.platypus import (
-        SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak,
+        SimpleDocTemplate, LongTable, TableStyle, Paragraph, Spacer, PageBreak,
     )
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 
-    _register_unicode_fonts()
-    font_name = "UniFont" if _FONT_REGISTERED else "Helvetica"
-    font_name_bold = "UniFont-Bold" if _FONT_REGISTERED else "Helvetica-Bold"
+    pdf_styles = _get_pdf_styles()
+    title_style = pdf_styles["title"]
+    subtitle_style = pdf_styles["subtitle"]
+    heading_style = pdf_styles["heading"]
+    cell_style = pdf_styles["cell"]
+    status_colors = {"Present": pdf_styles["good"], "Absent": pdf_styles["bad"]}
 
     # Use landscape for the potentially wide date-column table
     doc = SimpleDocTemplate(output_path, pagesize=landscape(A4),
                             leftMargin=15*mm, rightMargin=15*mm,
                             topMargin=15*mm, bottomMargin=15*mm)
 
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        "FullReportTitle", parent=styles["Title"],
-        fontName=font_name_bold, fontSize=18, spaceAfter=6,
-    )
-    subtitle_style = ParagraphStyle(
-        "FullReportSubtitle", parent=styles["Normal"],
-        fontName=font_name, fontSize=11, textColor=colors.grey, spaceAfter=12,
-    )
-    heading_style = ParagraphStyle(
-        "FullReportHeading", parent=styles["Heading2"],
-        fontName=font_name_bold, fontSize=13, spaceAfter=8,
-    )
-    cell_style = ParagraphStyle(
-        "CellWrap", parent=styles["Normal"],
-        fontName=font_name, fontSize=7, leading=9,
-    )
-
     elements = []
 
     # Title
@@ -415,48 +491,39 @@ def generate_full_section_pdf(report: dict, output_path: str) -> str:
     elements.append(Paragraph("Student Summary", heading_style))
 
     summary_data = [["#", "First Name", "Last Name", "Present", "Absent", "Sessions", "Rate"]]
-    for i, stu in enumerate(report["students"], 1):
-        summary_data.append([
-            str(i),
-            stu["first_name"],
-            stu["last_name"],
-            str(stu["total_present"]),
-            str(stu["total_absent"]),
-            str(stu["total_sessions"]),
-            stu["attendance_pct"],
-        ])
+    summary_data += [
+        [
+            str(i), stu["first_name"], stu["last_name"],
+            str(stu["total_present"]), str(stu["total_absent"]),
+            str(stu["total_sessions"]), stu["attendance_pct"],
+        ]
+        for i, stu in enumerate(report["students"], 1)
+    ]
 
     summary_col_widths = [30, 120, 120, 60, 60, 60, 60]
-    summary_table = Table(summary_data, colWidths=summary_col_widths)
-    summary_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1e40af")),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-        ("FONTNAME", (0, 0), (-1, 0), font_name_bold),
-        ("FONTNAME", (0, 1), (-1, -1), font_name),
-        ("FONTSIZE", (0, 0), (-1, -1), 9),
-        ("ALIGN", (0, 0), (0, -1), "CENTER"),
-        ("ALIGN", (3, 0), (-1, -1), "CENTER"),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-        ("ROWBACKGROUNDS", (0, 1), (-1, -1),
-         [colors.white, colors.HexColor("#f8f9fa")]),
-    ]))
+    summary_table = LongTable(summary_data, colWidths=summary_col_widths, repeatRows=1)
 
     # Colour-code the Rate column
-    for i, stu in enumerate(report["students"], 1):
+    rate_colors = []
+    for stu in report["students"]:
         pct_str = stu["attendance_pct"]
         try:
             pct_val = int(pct_str.replace("%", ""))
         except (ValueError, AttributeError):
             pct_val = -1
         if pct_val >= 75:
-            clr = colors.HexColor("#166534")
+            clr = pdf_styles["good"]
         elif pct_val >= 50:
-            clr = colors.HexColor("#92400e")
+            clr = pdf_styles["warn"]
         else:
-            clr = colors.HexColor("#991b1b")
-        summary_table.setStyle(TableStyle([
-            ("TEXTCOLOR", (6, i), (6, i), clr),
-        ]))
+            clr = pdf_styles["bad"]
+        rate_colors.append(clr)
+    style_cmds = list(pdf_styles["full_summary_cmds"])
+    style_cmds.extend(
+        ("TEXTCOLOR", (6, first), (6, last), clr)
+        for first, last, clr in _runs(rate_colors)
+    )
+    summary_table.setStyle(TableStyle(style_cmds))
 
     elements.append(summary_table)
     elements.append(Spacer(1, 8*mm))
@@ -482,62 +549,31 @@ def generate_full_section_pdf(report: dict, output_path: str) -> str:
                     heading_style,
                 ))
 
-            # Short date labels for column headers (MM-DD)
-            short_dates = []
-            for d in date_chunk:
-                try:
-                    short_dates.append(datetime.strptime(d, "%Y-%m-%d").strftime("%m/%d"))
-                except ValueError:
-                    short_dates.append(d[-5:])
-
-            header = ["Student"] + short_dates
+            # Short date labels for column headers (MM/DD)
+            header = ["Student"] + [_short_date(d) for d in date_chunk]
             grid_data = [header]
-
-            for stu in report["students"]:
-                row = [Paragraph(f"{stu['first_name']} {stu['last_name']}", cell_style)]
-                for d in date_chunk:
-                    status = stu["records"].get(d)
-                    if status == "Present":
-                        row.append("✓")
-                    elif status == "Absent":
-                        row.append("✗")
-                    else:
-                        row.append("—")
-                grid_data.append(row)
+            grid_data += [
+                [
+                    Paragraph(f"{stu['first_name']} {stu['last_name']}", cell_style),
+                    *[_GRID_MARKS.get(stu["records"].get(d), "—") for d in date_chunk],
+                ]
+                for stu in report["students"]
+            ]
 
             name_col_w = 110
             date_col_w = max(35, min(50, int((250 * mm - name_col_w) / len(date_chunk))))
             grid_col_widths = [name_col_w] + [date_col_w] * len(date_chunk)
 
-            grid_table = Table(grid_data, colWidths=grid_col_widths)
-            grid_style = [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#0f4c75")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                ("FONTNAME", (0, 0), (-1, 0), font_name_bold),
-                ("FONTNAME", (0, 1), (-1, -1), font_name),
-                ("FONTSIZE", (0, 0), (-1, 0), 7),
-                ("FONTSIZE", (0, 1), (-1, -1), 8),
-                ("ALIGN", (1, 0), (-1, -1), "CENTER"),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                ("ROWBACKGROUNDS", (0, 1), (-1, -1),
-                 [colors.white, colors.HexColor("#f8f9fa")]),
-            ]
+            grid_table = LongTable(grid_data, colWidths=grid_col_widths, repeatRows=1)
+            grid_style = list(pdf_styles["grid_cmds"])
 
-            # Colour-code individual status cells
-            for row_i, stu in enumerate(report["students"], 1):
-                for col_j, d in enumerate(date_chunk, 1):
-                    status = stu["records"].get(d)
-                    if status == "Present":
-                        grid_style.append(
-                            ("TEXTCOLOR", (col_j, row_i), (col_j, row_i),
-                             colors.HexColor("#166534"))
-                        )
-                    elif status == "Absent":
-                        grid_style.append(
-                            ("TEXTCOLOR", (col_j, row_i), (col_j, row_i),
-                             colors.HexColor("#991b1b"))
-                        )
+            # Colour-code status cells, one command per run of equal statuses
+            grid_style.extend(
+                ("TEXTCOLOR", (first, row_i), (last, row_i), status_colors[status])
+                for row_i, stu in enumerate(report["students"], 1)
+                for first, last, status in _runs(stu["records"].get(d) for d in date_chunk)
+                if status in status_colors
+            )
 
             grid_table.setStyle(TableStyle(grid_style))
             elements.append(grid_table)
@@ -547,8 +583,7 @@ def generate_full_section_pdf(report: dict, output_path: str) -> str:
     elements.append(Spacer(1, 6*mm))
     elements.append(Paragraph(
         f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-        ParagraphStyle("FullFooter", parent=styles["Normal"],
-                       fontName=font_name, fontSize=8, textColor=colors.grey),
+        pdf_styles["footer"],
     ))
 
     doc.build(elements)
@@ -82,10 +82,12 @@ def register_new_student(
         )
 
     try:
-        student_id = student_model.create_student(first_name, last_name, card_id)
+        with transaction():
+            student_id = student_model.create_student(first_name, last_name, card_id)
+            if section_id is not None:
+                student_model.assign_section(student_id, section_id)
 
         if section_id is not None:
-            student_model.assign_section(student_id, section_id)
             log_info(
                 f"Registered student id={student_id} "
                 f"name='{first_name} {last_name}' card='{card_id}' "
@@ -166,9 +168,12 @@ def register_student_with_sections(
         )
 
     try:
-        student_id = student_model.create_student(first_name, last_name, card_id)
-        for sec_id in section_ids:
-            student_model.assign_section(student_id, sec_id)
+        # The student row and every enrolment commit together (one fsync),
+        # and a failed enrolment leaves no half-registered student behind.
+        with transaction():
+            student_id = student_model.create_student(first_name, last_name, card_id)
+            for sec_id in section_ids:
+                student_model.assign_section(student_id, sec_id)
         log_info(
             f"Registered student id={student_id} name='{first_name} {last_name}' "
             f"card='{card_id}' sections={section_ids}"
@@ -337,6 +342,14 @@ def get_student_by_card_id(card_id: str):
     return student_model.get_student_by_card_id(card_id)
 
 
+def lookup_card(card_id: str) -> Optional[student_model.CardStudent]:
+    """Return (id, first_name, last_name, is_inactive) for a tapped card, or None.
+
+    Served from the model's card cache, so repeat taps skip the database.
+    """
+    return student_model.get_cached_student_by_card_id(card_id)
+
+
 def delete_student(student_id: int) -> tuple[bool, str]:
     """
     Delete a student by id.
@@ -512,6 +525,7 @@ def update_student_sections(
                     """,
                     (student_id, sec_id),
                 )
+        section_model.invalidate_day_sections()
         log_info(
             f"Section memberships updated for student_id={student_id}: {section_ids}"
         )
@@ -26,6 +26,7 @@ import customtkinter as ctk
 from utils.logger import log_info, log_error, log_startup, log_shutdown
 from utils.localization import load_from_settings as load_language
 from models.database import initialise_database, close_connection
+from controllers.attendance_controller import warm_up_tap_path
 from views.app import App
 
 
@@ -67,6 +68,7 @@ def main() -> None:
     try:
         initialise_database()
         log_info("Database initialised successfully.")
+        warm_up_tap_path()
         load_language()
         log_info(f"Language loaded.")
     except Exception as exc:
@@ -30,35 +30,82 @@ def mark_present(
     session_id: int,
     student_id: int,
     method: str = "RFID",
-) -> int:
+) -> Optional[int]:
     """
     Insert an attendance record with status 'Present'.
 
+    The insert and the duplicate check are one atomic statement
+    (``ON CONFLICT DO NOTHING``), so there is no check-then-write race.
+
     Args:
         session_id: FK reference to sessions.id.
         student_id: FK reference to students.id.
         method:     'RFID' or 'Manual'.
 
     Returns:
-        The id of the new attendance record.
-
-    Raises:
-        sqlite3.IntegrityError: If a record for (session_id, student_id) already exists.
+        The id of the new attendance record, or None if a record for
+        (session_id, student_id) already exists (left unchanged).
     """
     timestamp = datetime.now(timezone.utc).isoformat()
     with get_connection() as conn:
-        cursor = conn.execute(
+        row = conn.execute(
             """
             INSERT INTO attendance (session_id, student_id, status, method, timestamp)
-            VALUES (?, ?, 'Present', ?, ?);
+            VALUES (?, ?, 'Present', ?, ?)
+            ON CONFLICT (session_id, student_id) DO NOTHING
+            RETURNING id;
             """,
             (session_id, student_id, method, timestamp),
+        ).fetchone()
+    if row is None:
+        log_debug(
+            "Already recorded: session=%s student=%s", session_id, student_id
         )
-        new_id = cursor.lastrowid
+        return None
     log_debug(
-        f"Marked present: session={session_id} student={student_id} method={method}"
+        "Marked present: session=%s student=%s method=%s",
+        session_id, student_id, method,
     )
-    return new_id  # type: ignore[return-value]
+    return row["id"]
+
+
+def set_status_atomic(
+    session_id: int,
+    student_id: int,
+    status: str,
+    method: str = "Manual",
+) -> Optional[str]:
+    """
+    Record (session_id, student_id) as *status* ('Present' or 'Absent').
+
+    A single UPSERT: a missing record is inserted with *method*; an existing
+    record with a different status is switched to *status* with method
+    'Manual' (as toggle_status() does); a record that already has *status*
+    is left untouched.  There is no separate read before the write.
+
+    Returns:
+        *status* if a record was inserted or changed, None if it already had
+        that status.
+    """
+    timestamp = datetime.now(timezone.utc).isoformat()
+    with get_connection() as conn:
+        row = conn.execute(
+            """
+            INSERT INTO attendance (session_id, student_id, status, method, timestamp)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (session_id, student_id) DO UPDATE
+               SET status = excluded.status, method = 'Manual',
+                   timestamp = excluded.timestamp
+               WHERE attendance.status <> excluded.status
+            RETURNING status;
+            """,
+            (session_id, student_id, status, method, timestamp),
+        ).fetchone()
+    log_debug(
+        "Set status: session=%s student=%s → %s (%s)",
+        session_id, student_id, status, "written" if row else "unchanged",
+    )
+    return row[0] if row else None
 
 
 def mark_absent(
@@ -83,11 +130,82 @@ def mark_absent(
         )
         new_id = cursor.lastrowid
     log_debug(
-        f"Marked absent: session={session_id} student={student_id} method={method}"
+        "Marked absent: session=%s student=%s method=%s",
+        session_id, student_id, method,
     )
     return new_id  # type: ignore[return-value]
 
 
+def mark_present_in_sections(
+    student_id: int,
+    section_ids: list[int],
+    date_str: str,
+    method: str = "RFID",
+) -> tuple[list[int], list[int]]:
+    """
+    Mark a student Present in the sessions of several sections on one date.
+
+    Uses a fixed number of statements however many sections are involved:
+    one INSERT auto-creates any missing sessions, and one UPSERT inserts the
+    missing attendance records and flips existing 'Absent' records to
+    'Present' (method 'Manual', matching toggle_status()).  Records that are
+    already 'Present' are left untouched.
+
+    Args:
+        student_id:  FK reference to students.id.
+        section_ids: Sections to mark; an empty list is a no-op.
+        date_str:    ISO-8601 session date, e.g. '2026-02-20'.
+        method:      Method stored on newly inserted records.
+
+    Returns:
+        (newly_marked_section_ids, already_present_section_ids), each in the
+        order of *section_ids*.
+    """
+    if not section_ids:
+        return [], []
+    timestamp = datetime.now(timezone.utc).isoformat()
+    placeholders = ", ".join("?" * len(section_ids))
+    with get_connection() as conn:
+        conn.execute(
+            f"""
+            INSERT INTO sessions (section_id, date, start_time, status)
+            SELECT sec.id, ?, ?, 'active'
+            FROM   sections sec
+            WHERE  sec.id IN ({placeholders})
+              AND  NOT EXISTS (
+                       SELECT 1 FROM sessions s
+                       WHERE  s.section_id = sec.id AND s.date = ?
+                   );
+            """,
+            (date_str, timestamp, *section_ids, date_str),
+        )
+        rows = conn.execute(
+            f"""
+            INSERT INTO attendance (session_id, student_id, status, method, timestamp)
+            SELECT (SELECT s.id FROM sessions s
+                    WHERE  s.section_id = sec.id AND s.date = ?
+                    ORDER  BY s.start_time DESC
+                    LIMIT  1),
+                   ?, 'Present', ?, ?
+            FROM   sections sec
+            WHERE  sec.id IN ({placeholders})
+            ON CONFLICT (session_id, student_id) DO UPDATE
+               SET status = 'Present', method = 'Manual', timestamp = excluded.timestamp
+               WHERE attendance.status = 'Absent'
+            RETURNING (SELECT section_id FROM sessions WHERE id = attendance.session_id);
+            """,
+            (date_str, student_id, method, timestamp, *section_ids),
+        ).fetchall()
+    marked_set = {r[0] for r in rows}
+    marked = [sid for sid in section_ids if sid in marked_set]
+    already = [sid for sid in section_ids if sid not in marked_set]
+    log_debug(
+        "Marked present in sections: student=%s date=%s marked=%s already=%s",
+        student_id, date_str, marked, already,
+    )
+    return marked, already
+
+
 def toggle_status(session_id: int, student_id: int) -> str:
     """
     Toggle a student's attendance status between Present and Absent.
@@ -124,7 +242,8 @@ def toggle_status(session_id: int, student_id: int) -> str:
             (new_status, timestamp, session_id, student_id),
         )
     log_debug(
-        f"Toggled attendance: session={session_id} student={student_id} → {new_status}"
+        "Toggled attendance: session=%s student=%s → %s",
+        session_id, student_id, new_status,
     )
     return new_status
 
@@ -174,6 +293,42 @@ def is_duplicate_tap(session_id: int, student_id: int) -> bool:
     return get_attendance_record(session_id, student_id) is not None
 
 
+def get_overview_rows(student_id: int, date_str: str) -> list[AttendanceRow]:
+    """
+    Return one row per section the student is enrolled in, with that
+    section's session on *date_str* and the student's status in it.
+
+    Columns: section_id, section_name, day, time,
+    session_id (NULL if no session on that date — the most recent one is
+    used if several exist), status (NULL if no record).  Ordered by section
+    name.  One query replaces a session and an attendance lookup per section.
+    """
+    with get_connection() as conn:
+        return conn.execute(
+            """
+            SELECT sec.id   AS section_id,
+                   sec.name AS section_name,
+                   sec.day,
+                   sec.time,
+                   sess.id  AS session_id,
+                   a.status
+            FROM   student_sections ss
+            JOIN   sections         sec  ON sec.id = ss.section_id
+            LEFT JOIN sessions      sess ON sess.id = (
+                       SELECT id FROM sessions
+                       WHERE  section_id = sec.id AND date = ?
+                       ORDER  BY start_time DESC
+                       LIMIT  1
+                   )
+            LEFT JOIN attendance    a    ON a.session_id = sess.id
+                                        AND a.student_id = ss.student_id
+            WHERE  ss.student_id = ?
+            ORDER  BY sec.name;
+            """,
+            (date_str, student_id),
+        ).fetchall()
+
+
 def get_today_attendance_with_details(today_date: str) -> list[dict]:
     """
     Return all attendance records for the given date, enriched with student
@@ -277,33 +432,32 @@ def get_all_attendance_with_details() -> list[dict]:
     return result
 
 
-def get_total_attendance_per_student() -> list[dict]:
+def get_student_summary_rows() -> list[tuple]:
     """
-    Return one record per student showing how many sessions they attended
-    versus the total number of sessions for sections they are enrolled in.
-
-    Returns:
-        List of dicts with keys:
-            first_name, last_name, card_id,
-            attended       — count of 'Present' records for that student,
-            total_sessions — count of distinct sessions in enrolled sections,
-            summary        — formatted string "<attended>/<total_sessions>"
-        Ordered by last_name, first_name.
-        Students with no card_id (NULL) are included.
-        If a student is enrolled in multiple sections, counts are summed
-        across all sections.
+    Return the cumulative summary in export shape.
+
+    One row per student: how many sessions they attended versus the total
+    number of (non-excluded) sessions across every section they are enrolled
+    in.  Each row is a plain tuple
+    ``(student_id, first_name, last_name, card_id, summary)`` with
+    ``card_id`` as ``''`` when unset and ``summary`` already formatted as
+    ``"<attended>/<total_sessions>"`` by SQLite.  Ordered by last_name,
+    first_name; students with no enrolments get ``"0/0"``.
     """
     with get_connection() as conn:
-        rows = conn.execute(
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        return cursor.execute(
             f"""
             SELECT s.id,
                    s.first_name,
                    s.last_name,
-                   s.card_id,
+                   COALESCE(s.card_id, ''),
                    COUNT(DISTINCT CASE WHEN a.status = 'Present'
-                         THEN sess.section_id || '|' || sess.date END) AS attended,
+                         THEN sess.section_id || '|' || sess.date END)
+                   || '/' ||
                    COUNT(DISTINCT CASE WHEN sess.date IS NOT NULL
-                         THEN sess.section_id || '|' || sess.date END) AS total_sessions
+                         THEN sess.section_id || '|' || sess.date END)
             FROM   students         s
             LEFT JOIN student_sections ss   ON ss.student_id   = s.id
             LEFT JOIN sessions         sess ON sess.section_id = ss.section_id
@@ -315,51 +469,26 @@ def get_total_attendance_per_student() -> list[dict]:
             """,
         ).fetchall()
 
-    result: list[dict] = []
-    for row in rows:
-        attended = row["attended"] or 0
-        total = row["total_sessions"] or 0
-        result.append(
-            {
-                "id":           row["id"],
-                "first_name":   row["first_name"],
-                "last_name":    row["last_name"],
-                "card_id":      row["card_id"],
-                "attended":     attended,
-                "total_sessions": total,
-                "summary":      f"{attended}/{total}",
-            }
-        )
-    return result
 
-
-def get_per_section_attendance_per_student() -> list[dict]:
+def get_section_summary_rows() -> list[tuple]:
     """
-    Return per-student, per-section attendance breakdown.
-
-    Each row represents one student–section combination with:
-        student_id, first_name, last_name, card_id,
-        section_id, section_name, section_day, section_time,
-        attended       — count of 'Present' records for the student in that section,
-        total_sessions — count of distinct sessions for that section,
-        summary        — formatted "<attended>/<total_sessions>"
+    Return the per-section breakdown in export shape.
 
-    Ordered by student last_name, first_name, then section name.
+    One row per student–section enrolment, as a plain tuple
+    ``(student_id, section_name, summary)`` where ``summary`` is
+    ``"<attended>/<total_sessions>"`` for that section.  Ordered by student
+    last_name, first_name, then section name.
     """
     with get_connection() as conn:
-        rows = conn.execute(
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        return cursor.execute(
             f"""
-            SELECT s.id             AS student_id,
-                   s.first_name,
-                   s.last_name,
-                   s.card_id,
-                   sec.id           AS section_id,
-                   sec.name         AS section_name,
-                   sec.day          AS section_day,
-                   sec.time         AS section_time,
+            SELECT s.id,
+                   sec.name,
                    COUNT(DISTINCT CASE WHEN a.status = 'Present'
-                         THEN sess.date END)                         AS attended,
-                   COUNT(DISTINCT sess.date)                         AS total_sessions
+                         THEN sess.date END)
+                   || '/' || COUNT(DISTINCT sess.date)
             FROM   students          s
             JOIN   student_sections   ss   ON ss.student_id   = s.id
             JOIN   sections           sec  ON sec.id          = ss.section_id
@@ -372,25 +501,6 @@ def get_per_section_attendance_per_student() -> list[dict]:
             """,
         ).fetchall()
 
-    result: list[dict] = []
-    for row in rows:
-        attended = row["attended"] or 0
-        total = row["total_sessions"] or 0
-        result.append({
-            "student_id":    row["student_id"],
-            "first_name":    row["first_name"],
-            "last_name":     row["last_name"],
-            "card_id":       row["card_id"],
-            "section_id":    row["section_id"],
-            "section_name":  row["section_name"],
-            "section_day":   row["section_day"],
-            "section_time":  row["section_time"],
-            "attended":      attended,
-            "total_sessions": total,
-            "summary":       f"{attended}/{total}",
-        })
-    return result
-
 
 def get_student_attendance_summary(student_id: int) -> tuple[int, int]:
     """
@@ -587,4 +697,86 @@ def get_consecutive_recent_absences(student_id: int) -> int:
         if rec["status"] == "Present":
             break
         count += 1
-    return count
\ No newline at end of file
+    return count
+
+def apply_inactive_threshold(
+    threshold: int,
+    student_id: Optional[int] = None,
+) -> tuple[int, int]:
+    """
+    Recompute every student's ``is_inactive`` flag in a single UPDATE.
+
+    Uses the same rules as get_consecutive_recent_absences() — low-attendance
+    sessions excluded, duplicate sessions for a section+date collapsed to the
+    latest record, missing records counted as absent — but evaluates the
+    streak for all students at once with window functions instead of one
+    query per student.  Only rows whose flag actually changes are written.
+
+    Args:
+        threshold:  Consecutive absences at or above which a student is inactive.
+        student_id: Restrict the update to this one student (the tap path).
+
+    Returns:
+        (newly_inactive_count, newly_active_count).
+    """
+    if student_id is None:
+        enrolment_filter = student_filter = ""
+        params: tuple = (threshold,)
+    else:
+        enrolment_filter = "WHERE  ss.student_id = ?"
+        student_filter = "WHERE  s.id = ?"
+        params = (student_id, threshold, student_id)
+    with get_connection() as conn:
+        rows = conn.execute(
+            f"""
+            WITH slots AS (
+                SELECT ss.student_id,
+                       sess.date,
+                       COALESCE(a.status, 'Absent') AS status,
+                       a.timestamp,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY ss.student_id, sess.section_id, sess.date
+                           ORDER BY a.timestamp DESC
+                       ) AS dup_rank
+                FROM   student_sections ss
+                JOIN   sessions         sess ON sess.section_id = ss.section_id
+                                            AND sess.id NOT IN ({_LOW_ATTENDANCE_SUBQUERY})
+                LEFT JOIN attendance    a    ON a.session_id    = sess.id
+                                            AND a.student_id    = ss.student_id
+                {enrolment_filter}
+            ),
+            ordered AS (
+                SELECT student_id,
+                       status,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY student_id
+                           ORDER BY date DESC, timestamp DESC
+                       ) AS pos
+                FROM   slots
+                WHERE  dup_rank = 1
+            ),
+            streaks AS (
+                SELECT student_id,
+                       COALESCE(MIN(CASE WHEN status = 'Present' THEN pos END) - 1,
+                                COUNT(*)) AS consec
+                FROM   ordered
+                GROUP  BY student_id
+            ),
+            target AS (
+                SELECT s.id,
+                       COALESCE(st.consec, 0) >= ? AS should_be_inactive
+                FROM   students s
+                LEFT JOIN streaks st ON st.student_id = s.id
+                {student_filter}
+            )
+            UPDATE students
+            SET    is_inactive = target.should_be_inactive
+            FROM   target
+            WHERE  target.id = students.id
+              AND  students.is_inactive != target.should_be_inactive
+            RETURNING students.is_inactive;
+            """,
+            params,
+        ).fetchall()
+    became_inactive = sum(1 for r in rows if r[0])
+    return became_inactive, len(rows) - became_inactive
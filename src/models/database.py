@@ -3,7 +3,8 @@ database.py — SQLite connection manager.
 
 Responsibilities:
 - Resolve the path to attendance.db (project root).
-- Open connections with WAL journal mode enabled on every open.
+- Open connections with WAL journal mode and tuning PRAGMAs on every open.
+- Periodically checkpoint the WAL so it cannot grow without bound.
 - Initialise the full schema (6 tables) on first run.
 - Provide a lightweight migration mechanism via a schema_version table.
 """
@@ -16,7 +17,7 @@ from pathlib import Path
 from contextlib import contextmanager
 from typing import Generator
 
-from utils.logger import log_info, log_error, log_debug
+from utils.logger import log_info, log_error, log_debug, log_warning
 
 # ── Thread-local connection cache ─────────────────────────────────────────────
 _local = threading.local()
@@ -41,7 +42,7 @@ _APP_DIR = _get_app_dir()
 DB_PATH: str = str(_APP_DIR / "attendance.db")
 
 # ── Current schema version ────────────────────────────────────────────────────
-_SCHEMA_VERSION = 3
+_SCHEMA_VERSION = 4
 
 # ── DDL statements ─────────────────────────────────────────────────────────────
 _DDL_SCHEMA_VERSION = """
@@ -120,6 +121,19 @@ _ALL_DDL = [
     _DDL_SETTINGS,
 ]
 
+_INDEX_DDL = [
+    # Covers duplicate / status checks without touching the table rows.
+    "CREATE INDEX IF NOT EXISTS idx_attendance_sess_stu_status "
+    "ON attendance(session_id, student_id, status, method);",
+    # Session-by-date lookups (daily report, get_or_create_session).
+    "CREATE INDEX IF NOT EXISTS idx_sessions_date_section "
+    "ON sessions(date, section_id);",
+    "CREATE INDEX IF NOT EXISTS idx_sections_day ON sections(day);",
+    # Reverse of the student_sections primary key (section → students).
+    "CREATE INDEX IF NOT EXISTS idx_student_sections_section "
+    "ON student_sections(section_id, student_id);",
+]
+
 # ── Default settings rows ─────────────────────────────────────────────────────
 _DEFAULT_SETTINGS: list[tuple[str, str]] = [
     ("absence_threshold", "3"),
@@ -135,9 +149,26 @@ def _get_raw_connection() -> sqlite3.Connection:
     Open a fresh SQLite connection with the required PRAGMAs applied.
     Used internally by initialise_database() and _get_cached_connection().
     """
-    conn = sqlite3.connect(DB_PATH)
+    # A larger statement cache keeps every hot query compiled for the
+    # lifetime of the long-lived connection (the default holds only 100).
+    conn = sqlite3.connect(DB_PATH, cached_statements=256)
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL;")
+    # The PRAGMA answers with the mode actually in effect; SQLite quietly
+    # keeps the rollback journal where WAL is unavailable (e.g. a network
+    # share), which puts a full fsync back on every tap commit.
+    journal_mode = conn.execute("PRAGMA journal_mode=WAL;").fetchone()[0]
+    if journal_mode.lower() != "wal":
+        log_warning(
+            "SQLite could not enable WAL for %s (journal_mode=%s); "
+            "attendance writes will be slower.",
+            DB_PATH, journal_mode,
+        )
+    # NORMAL is durable in WAL mode (only the last commits can be lost on
+    # power failure) and avoids an fsync on every single tap commit.
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA busy_timeout=5000;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-20000;")   # ~20 MB page cache
     conn.execute("PRAGMA foreign_keys=ON;")
     return conn
 
@@ -162,6 +193,7 @@ def close_connection() -> None:
     if conn is not None:
         conn.close()
         _local.conn = None
+        _local.tx_depth = 0
         log_info("Thread-local DB connection closed.")
 
 
@@ -171,6 +203,8 @@ def get_connection() -> Generator[sqlite3.Connection, None, None]:
 
     Commits on clean exit, rolls back on ``sqlite3.Error``.
     The connection is *not* closed on exit — it is kept alive for the thread.
+    Inside a ``transaction()`` block it neither commits nor rolls back; the
+    enclosing transaction owns the outcome.
 
     Usage::
 
@@ -178,18 +212,77 @@ def get_connection() -> Generator[sqlite3.Connection, None, None]:
             conn.execute("INSERT INTO ...")
     """
     conn = _get_cached_connection()
+    if getattr(_local, "tx_depth", 0):
+        # Joined to an enclosing transaction() — it commits once at the end.
+        yield conn
+        return
     try:
         yield conn
         conn.commit()
     except sqlite3.Error as exc:
         conn.rollback()
-        log_error(f"DB error — rolling back transaction: {exc}")
+        log_error("DB error — rolling back transaction: %s", exc)
         raise
     # Note: no conn.close() — connection persists for thread lifetime
 
 
-# Alias used by controllers that want explicit transaction semantics.
-transaction = get_connection
+@contextmanager
+def transaction() -> Generator[sqlite3.Connection, None, None]:
+    """Context manager that groups many model calls into ONE write transaction.
+
+    Takes the write lock up-front with ``BEGIN IMMEDIATE`` and makes every
+    ``get_connection()`` opened inside the block (including those inside
+    model functions) join it instead of committing on its own, so the whole
+    block costs a single commit.  Nested ``transaction()`` blocks join the
+    outermost one.  Any exception rolls the whole block back.
+
+    Usage::
+
+        with transaction():
+            student_model.create_student(...)
+            attendance_model.mark_present(...)
+    """
+    conn = _get_cached_connection()
+    depth: int = getattr(_local, "tx_depth", 0)
+    if depth == 0:
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE;")
+    _local.tx_depth = depth + 1
+    try:
+        yield conn
+    except BaseException as exc:
+        _local.tx_depth = depth
+        if depth == 0:
+            conn.rollback()
+            log_error("Transaction rolled back: %s", exc)
+        raise
+    _local.tx_depth = depth
+    if depth == 0:
+        conn.commit()
+
+
+def checkpoint_wal() -> None:
+    """Copy as much of the WAL back into the main database file as possible.
+
+    Readers holding the WAL open can starve SQLite's automatic checkpoints,
+    letting ``attendance.db-wal`` grow indefinitely on a long-running kiosk.
+    The checkpoint is PASSIVE: it never waits on the busy handler, so a
+    background Sheets push or PDF export holding the database cannot stall
+    the Tk main loop; frames it cannot copy now are picked up next time.
+    Called periodically by ``views/app.py`` via ``App._schedule_wal_checkpoint()``.
+    """
+    try:
+        conn = _get_cached_connection()
+        busy, log_frames, moved = conn.execute(
+            "PRAGMA wal_checkpoint(PASSIVE);"
+        ).fetchone()
+        log_debug(
+            "WAL checkpoint: busy=%s log_frames=%s checkpointed=%s",
+            busy, log_frames, moved,
+        )
+    except sqlite3.Error as exc:
+        log_error("WAL checkpoint failed: %s", exc)
 
 
 def initialise_database() -> None:
@@ -198,7 +291,7 @@ def initialise_database() -> None:
     Runs the schema migration if the stored version is older than current.
     Safe to call on every startup.
     """
-    log_info(f"Initialising database at {DB_PATH}")
+    log_info("Initialising database at %s", DB_PATH)
     conn = _get_cached_connection()
     try:
         cursor = conn.cursor()
@@ -230,18 +323,21 @@ def initialise_database() -> None:
             max_ver = cursor.execute("SELECT MAX(version) FROM schema_version;").fetchone()[0]
             cursor.execute("DELETE FROM schema_version;")
             cursor.execute("INSERT INTO schema_version (version) VALUES (?);", (max_ver,))
-            log_info(f"Cleaned up {row_count} duplicate schema_version rows → kept v{max_ver}.")
+            log_info(
+                "Cleaned up %s duplicate schema_version rows → kept v%s.",
+                row_count, max_ver,
+            )
 
         conn.commit()
         stored_ver = cursor.execute("SELECT version FROM schema_version;").fetchone()[0]
-        log_debug(f"Schema initialised at version {stored_ver}.")
+        log_debug("Schema initialised at version %s.", stored_ver)
 
         # Run any pending migrations
         _run_migrations(cursor, conn)
 
     except sqlite3.Error as exc:
         conn.rollback()
-        log_error(f"Schema initialisation failed: {exc}")
+        log_error("Schema initialisation failed: %s", exc)
         raise
 
 
@@ -266,12 +362,36 @@ def _run_migrations(cursor: sqlite3.Cursor, conn: sqlite3.Connection) -> None:
         # v3: remove phantom duplicate sessions and consolidate attendance
         _migrate_v3_deduplicate_sessions(cursor, conn)
 
+    if stored_version < 4:
+        # v4: composite / covering indexes for the tap and report hot paths
+        _migrate_v4_add_indexes(cursor, conn)
+
     if stored_version < _SCHEMA_VERSION:
         cursor.execute(
             "UPDATE schema_version SET version = ?;", (_SCHEMA_VERSION,)
         )
         conn.commit()
-        log_info(f"Migrated schema from v{stored_version} → v{_SCHEMA_VERSION}.")
+        log_info(
+            "Migrated schema from v%s → v%s.", stored_version, _SCHEMA_VERSION
+        )
+
+
+def _migrate_v4_add_indexes(
+    cursor: sqlite3.Cursor, conn: sqlite3.Connection
+) -> None:
+    """
+    Migration v3→v4: Add indexes for the per-tap lookups and daily report.
+
+    students.card_id, attendance(session_id, student_id) and
+    student_sections(student_id, section_id) are already indexed by their
+    UNIQUE / PRIMARY KEY constraints, so only the missing access paths are
+    added.  ANALYZE runs afterwards so the planner picks them up immediately.
+    """
+    for ddl in _INDEX_DDL:
+        cursor.execute(ddl)
+    cursor.execute("ANALYZE;")
+    conn.commit()
+    log_info("Migration v3→v4: created %s indexes.", len(_INDEX_DDL))
 
 
 def _migrate_v3_deduplicate_sessions(
@@ -379,12 +499,14 @@ def _migrate_v3_deduplicate_sessions(
 
         conn.commit()
         log_info(
-            f"Migration v2→v3: deduplicated {len(dup_groups)} session groups — "
-            f"removed {total_sessions_removed} phantom sessions, "
-            f"moved {total_attendance_moved} attendance records, "
-            f"deleted {total_attendance_deleted} conflicting duplicates."
+            "Migration v2→v3: deduplicated %s session groups — "
+            "removed %s phantom sessions, "
+            "moved %s attendance records, "
+            "deleted %s conflicting duplicates.",
+            len(dup_groups), total_sessions_removed,
+            total_attendance_moved, total_attendance_deleted,
         )
     except sqlite3.Error as exc:
         conn.rollback()
-        log_error(f"Migration v2→v3 FAILED (rolled back): {exc}")
+        log_error("Migration v2→v3 FAILED (rolled back): %s", exc)
         raise
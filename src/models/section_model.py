@@ -3,7 +3,7 @@ section_model.py — Data-access layer for the sections and student_sections tab
 """
 
 import sqlite3
-from typing import Optional
+from typing import NamedTuple, Optional
 
 from models.database import get_connection
 from utils.logger import log_debug
@@ -11,6 +11,17 @@ from utils.logger import log_debug
 SectionRow = sqlite3.Row
 
 
+class DaySection(NamedTuple):
+    """The section fields the passive tap path needs."""
+    id: int
+    name: str
+
+
+# Lower-cased weekday → {student_id: [DaySection, …]}, filled lazily by
+# get_sections_for_students_on_day() and emptied by invalidate_day_sections().
+_day_sections: dict[str, dict[int, list[DaySection]]] = {}
+
+
 def create_section(
     name: str,
     type_: str,
@@ -80,6 +91,7 @@ def update_section(
             """,
             (name.strip(), type_.strip(), level.strip(), day.strip(), time.strip(), section_id),
         )
+    invalidate_day_sections()
     log_debug(f"Updated section id={section_id}")
 
 
@@ -112,6 +124,7 @@ def delete_section(section_id: int) -> None:
         )
         # 4. Remove the section row itself
         conn.execute("DELETE FROM sections WHERE id = ?;", (section_id,))
+    invalidate_day_sections()
     log_debug(f"Deleted section id={section_id} (cascade)")
 
 
@@ -148,3 +161,39 @@ def get_sections_for_student_on_day(student_id: int, day: str) -> list[sqlite3.R
             (student_id, day),
         ).fetchall()
     return rows
+
+
+def get_sections_for_students_on_day(day: str) -> dict[int, list[DaySection]]:
+    """
+    Return every enrolment scheduled on *day* as {student_id: [DaySection]}.
+
+    One query covers the whole roster and the result is kept until an
+    enrolment or section changes, so each passive tap is a dict lookup.
+    Writes in this module and in student_model call invalidate_day_sections();
+    code that writes sections or student_sections with raw SQL must call it
+    as well.  The returned mapping is shared — do not mutate it.
+    """
+    key = day.lower()
+    by_student = _day_sections.get(key)
+    if by_student is None:
+        by_student = {}
+        with get_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT ss.student_id, s.id, s.name
+                FROM sections s
+                JOIN student_sections ss ON ss.section_id = s.id
+                WHERE LOWER(s.day) = ?
+                ORDER BY s.id;
+                """,
+                (key,),
+            ).fetchall()
+        for student_id, section_id, name in rows:
+            by_student.setdefault(student_id, []).append(DaySection(section_id, name))
+        _day_sections[key] = by_student
+    return by_student
+
+
+def invalidate_day_sections() -> None:
+    """Drop the cached per-day enrolments (call after any enrolment change)."""
+    _day_sections.clear()
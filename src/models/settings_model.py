@@ -14,19 +14,30 @@ from typing import Optional
 from models.database import get_connection
 from utils.logger import log_debug
 
+# key → value (None for a missing key).  Settings are read on every tap but
+# only change through set_setting(), which drops the affected entry.
+_cache: dict[str, Optional[str]] = {}
+
 
 def get_setting(key: str) -> Optional[str]:
     """
     Return the value for the given settings key, or None if not found.
 
+    Values are cached in memory after the first read.
+
     Args:
         key: The settings key to look up.
     """
+    try:
+        return _cache[key]
+    except KeyError:
+        pass
     with get_connection() as conn:
         row = conn.execute(
             "SELECT value FROM settings WHERE key = ?;", (key,)
         ).fetchone()
-    return row["value"] if row else None
+    value = _cache[key] = row["value"] if row else None
+    return value
 
 
 def set_setting(key: str, value: str) -> None:
@@ -42,6 +53,7 @@ def set_setting(key: str, value: str) -> None:
             "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?);",
             (key, value),
         )
+    _cache.pop(key, None)
     log_debug(f"Setting updated: {key!r}")
 
 
@@ -50,3 +62,8 @@ def get_all_settings() -> dict[str, str]:
     with get_connection() as conn:
         rows = conn.execute("SELECT key, value FROM settings;").fetchall()
     return {row["key"]: row["value"] for row in rows}
+
+
+def invalidate_settings_cache() -> None:
+    """Drop every cached setting (call after writing settings with raw SQL)."""
+    _cache.clear()
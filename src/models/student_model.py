@@ -5,11 +5,13 @@ All methods open their own connection via get_connection() so callers at the
 controller layer do not need to manage connections directly.
 """
 
+import functools
 import sqlite3
 from datetime import datetime, timezone
-from typing import Optional
+from typing import NamedTuple, Optional
 
 from models.database import get_connection
+from models.section_model import invalidate_day_sections
 from utils.logger import log_debug, log_error
 
 
@@ -17,6 +19,24 @@ from utils.logger import log_debug, log_error
 StudentRow = sqlite3.Row
 
 
+class CardStudent(NamedTuple):
+    """The student fields the RFID tap path needs.
+
+    Immutable, so it can be cached safely and outlive the connection that
+    produced it; fields are read by position or attribute, never by name
+    lookup as with sqlite3.Row.
+    """
+    id: int
+    first_name: str
+    last_name: str
+    is_inactive: bool
+
+
+def _card_student_factory(_cursor: sqlite3.Cursor, row: tuple) -> CardStudent:
+    """Row factory building a CardStudent straight from the raw tuple."""
+    return CardStudent(row[0], row[1], row[2], bool(row[3]))
+
+
 def create_student(
     first_name: str,
     last_name: str,
@@ -47,6 +67,7 @@ def create_student(
             (first_name.strip(), last_name.strip(), card_id, created_at),
         )
         new_id = cursor.lastrowid
+    invalidate_card_cache()
     log_debug(f"Created student id={new_id} name='{first_name} {last_name}'")
     return new_id  # type: ignore[return-value]
 
@@ -69,6 +90,31 @@ def get_student_by_card_id(card_id: str) -> Optional[StudentRow]:
     return row
 
 
+@functools.lru_cache(maxsize=4096)
+def get_cached_student_by_card_id(card_id: str) -> Optional[CardStudent]:
+    """
+    Cached card lookup for the RFID tap path.
+
+    The students table changes rarely compared with how often cards are
+    tapped, so repeat taps are answered from memory.  Unknown cards are cached
+    too (as None).  Every write in this module that can change the result
+    calls invalidate_card_cache(); code that writes the students table with
+    raw SQL must call it as well.
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = _card_student_factory
+        return cursor.execute(
+            "SELECT id, first_name, last_name, is_inactive FROM students WHERE card_id = ?;",
+            (card_id,),
+        ).fetchone()
+
+
+def invalidate_card_cache() -> None:
+    """Drop every cached card lookup (call after any write to students)."""
+    get_cached_student_by_card_id.cache_clear()
+
+
 def get_all_students() -> list[StudentRow]:
     """Return all students ordered by RFID card_id ascending (numerically), then name."""
     with get_connection() as conn:
@@ -79,6 +125,19 @@ def get_all_students() -> list[StudentRow]:
     return rows
 
 
+def get_name_and_card_rows() -> list[tuple[str, str, Optional[str]]]:
+    """Return ``(first_name, last_name, card_id)`` for every student.
+
+    Only the columns the import de-duplication needs, as plain tuples.
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        return cursor.execute(
+            "SELECT first_name, last_name, card_id FROM students;"
+        ).fetchall()
+
+
 def update_student(
     student_id: int,
     first_name: str,
@@ -93,6 +152,7 @@ def update_student(
             """,
             (first_name.strip(), last_name.strip(), student_id),
         )
+    invalidate_card_cache()
     log_debug(f"Updated student id={student_id}")
 
 
@@ -111,6 +171,8 @@ def delete_student(student_id: int) -> None:
             "DELETE FROM student_sections WHERE student_id = ?;", (student_id,)
         )
         conn.execute("DELETE FROM students WHERE id = ?;", (student_id,))
+    invalidate_card_cache()
+    invalidate_day_sections()
     log_debug(f"Deleted student id={student_id} (including attendance records)")
 
 
@@ -126,6 +188,7 @@ def assign_card(student_id: int, card_id: str) -> None:
             "UPDATE students SET card_id = ? WHERE id = ?;",
             (card_id, student_id),
         )
+    invalidate_card_cache()
     log_debug(f"Assigned card '{card_id}' to student id={student_id}")
 
 
@@ -151,6 +214,7 @@ def assign_card_to_student(student_id: int, card_id: str) -> tuple[bool, str]:
                 "UPDATE students SET card_id = ? WHERE id = ?;",
                 (card_id, student_id),
             )
+        invalidate_card_cache()
         log_debug(f"Atomic card assign: card='{card_id}' → student id={student_id}")
         return True, ""
     except sqlite3.IntegrityError:
@@ -163,6 +227,7 @@ def remove_card(student_id: int) -> None:
         conn.execute(
             "UPDATE students SET card_id = NULL WHERE id = ?;", (student_id,)
         )
+    invalidate_card_cache()
     log_debug(f"Removed card from student id={student_id}")
 
 
@@ -176,6 +241,7 @@ def assign_section(student_id: int, section_id: int) -> None:
             """,
             (student_id, section_id),
         )
+    invalidate_day_sections()
 
 
 def remove_section(student_id: int, section_id: int) -> None:
@@ -188,6 +254,7 @@ def remove_section(student_id: int, section_id: int) -> None:
             """,
             (student_id, section_id),
         )
+    invalidate_day_sections()
 
 
 def get_sections_for_student(student_id: int) -> list[StudentRow]:
@@ -213,6 +280,7 @@ def set_inactive_status(student_id: int, inactive: bool) -> None:
             "UPDATE students SET is_inactive = ? WHERE id = ?;",
             (1 if inactive else 0, student_id),
         )
+    invalidate_card_cache()
     log_debug(
         f"Student id={student_id} marked {'inactive' if inactive else 'active'}"
     )
@@ -0,0 +1,35 @@
+"""
+google_credentials.py — Shared loader for Google service-account credentials.
+
+Both the Sheets summary push and the legacy Sheets import authenticate with
+the JSON key file named by the ``google_credentials_path`` setting.  Parsing
+that file (JSON + RSA private key) on every call is wasted work, so the
+resulting Credentials object is cached per (path, modification time,
+scopes): a replaced key file is picked up automatically.  Each caller keeps
+its own scopes (the import stays read-only), so the push and the import hold
+separate Credentials objects; repeated pushes or previews reuse theirs.
+
+google-auth is an optional dependency and is imported lazily on first use.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+
+
+def load_credentials(path: str, scopes: tuple[str, ...]):
+    """Return service-account Credentials for *path* with the given *scopes*.
+
+    Raises:
+        FileNotFoundError: If *path* does not exist.
+        ImportError:       If google-auth is not installed.
+    """
+    return _load_credentials(path, os.path.getmtime(path), scopes)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_credentials(path: str, _mtime: float, scopes: tuple[str, ...]):
+    from google.oauth2.service_account import Credentials  # type: ignore[import]
+
+    return Credentials.from_service_account_file(path, scopes=list(scopes))
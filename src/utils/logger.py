@@ -3,10 +3,16 @@ logger.py — Application-wide file logger with timestamps.
 
 Writes all events to logs/attendance_YYYY-MM-DD.log
 Events covered: app startup/shutdown, card taps, session start/end, errors, imports, exports.
+
+Callers only enqueue records (QueueHandler); a background QueueListener
+thread does the file writes, so logging never blocks the tap path on disk
+I/O.  The listener is stopped — and the queue flushed — at interpreter exit.
 """
 
+import atexit
 import logging
 import logging.handlers
+import queue
 from datetime import datetime
 from pathlib import Path
 
@@ -37,29 +43,37 @@ if not _logger.handlers:
         datefmt="%Y-%m-%dT%H:%M:%S",
     )
     _file_handler.setFormatter(_formatter)
-    _logger.addHandler(_file_handler)
+
+    _log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _listener = logging.handlers.QueueListener(
+        _log_queue, _file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(_listener.stop)
 
 
 # ── Core log functions ────────────────────────────────────────────────────────
+# Extra positional args are %-formatted by logging, e.g. log_info("id=%s", sid).
 
-def log_info(message: str) -> None:
+def log_info(message: str, *args: object) -> None:
     """Log an informational message."""
-    _logger.info(message)
+    _logger.info(message, *args)
 
 
-def log_warning(message: str) -> None:
+def log_warning(message: str, *args: object) -> None:
     """Log a warning message."""
-    _logger.warning(message)
+    _logger.warning(message, *args)
 
 
-def log_error(message: str) -> None:
+def log_error(message: str, *args: object) -> None:
     """Log an error message (full trace should be appended by caller if available)."""
-    _logger.error(message)
+    _logger.error(message, *args)
 
 
-def log_debug(message: str) -> None:
+def log_debug(message: str, *args: object) -> None:
     """Log a debug message."""
-    _logger.debug(message)
+    _logger.debug(message, *args)
 
 
 # ── Structured event helpers ──────────────────────────────────────────────────
@@ -15,9 +15,10 @@ import customtkinter as ctk
 from views.attendance_tab import AttendanceTab
 from utils.logger import log_info, log_error, log_warning
 from utils.backup import create_backup
-from models.database import close_connection
+from models.database import close_connection, checkpoint_wal
 
 _BACKUP_INTERVAL_MS = 4 * 60 * 60 * 1000  # 4 hours
+_CHECKPOINT_INTERVAL_MS = 10 * 60 * 1000  # 10 minutes
 
 
 class App(ctk.CTk):
@@ -42,6 +43,9 @@ class App(ctk.CTk):
         # Periodic auto-backup every 4 hours (first backup runs on startup)
         self.after(0, self._schedule_auto_backup)
 
+        # Periodic WAL checkpoint so the -wal file does not grow unbounded
+        self.after(_CHECKPOINT_INTERVAL_MS, self._schedule_wal_checkpoint)
+
         # ── Build UI ──────────────────────────────────────────────────────────
         self._build_ui()
 
@@ -133,3 +137,8 @@ class App(ctk.CTk):
         from models.database import DB_PATH
         create_backup(DB_PATH)
         self.after(_BACKUP_INTERVAL_MS, self._schedule_auto_backup)
+
+    def _schedule_wal_checkpoint(self) -> None:
+        """Checkpoint the SQLite WAL then reschedule every 10 minutes."""
+        checkpoint_wal()
+        self.after(_CHECKPOINT_INTERVAL_MS, self._schedule_wal_checkpoint)
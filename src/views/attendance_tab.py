@@ -37,6 +37,7 @@ _FLASH_YELLOW = "#713f12"
 _FLASH_PURPLE = "#3b1f5e"   # inactive student scan
 _BASE_BG      = "#1a1a2e"
 _FLASH_MS     = 2500
+_LOG_REFRESH_MS = 150   # taps within this window share one log refresh
 
 
 class AttendanceTab(ctk.CTkFrame):
@@ -46,6 +47,7 @@ class AttendanceTab(ctk.CTkFrame):
         super().__init__(parent, fg_color=_BASE_BG, corner_radius=0)
         self._app  = root
         self._flash_job: Optional[str] = None
+        self._log_refresh_job: Optional[str] = None
         # Log optimisation: track which record IDs have already been rendered
         self._log_rendered_ids: set[int] = set()
         self._no_taps_lbl: Optional[ctk.CTkLabel] = None
@@ -518,7 +520,7 @@ class AttendanceTab(ctk.CTkFrame):
                 self._flash(_FLASH_PURPLE, inactive_msg)
             else:
                 self._flash(_FLASH_GREEN, result.message)
-            self._refresh_log()
+            self._schedule_log_refresh()
 
         elif result.result_type == TapResultType.DUPLICATE_TAP:
             if result.is_inactive:
@@ -540,20 +542,31 @@ class AttendanceTab(ctk.CTkFrame):
             from tkinter import messagebox
             messagebox.showerror("Tap Error", result.message, parent=self._app)
 
+    def _schedule_log_refresh(self) -> None:
+        """Refresh Today's Log shortly after a tap.
+
+        The flash banner is the tap acknowledgement; the log query and row
+        widgets are deferred so a burst of taps is rendered in one refresh.
+        """
+        if self._log_refresh_job is None:
+            self._log_refresh_job = self.after(_LOG_REFRESH_MS, self._run_log_refresh)
+
+    def _run_log_refresh(self) -> None:
+        self._log_refresh_job = None
+        self._refresh_log()
+
     def _process_card_section_mode(self, card_id: str) -> None:
         """Section Mode: open section picker before marking present."""
         import controllers.student_controller as student_ctrl
         from datetime import datetime as _dt
 
-        student = student_ctrl.get_student_by_card_id(card_id)
+        student = student_ctrl.lookup_card(card_id)
         if student is None:
             self._flash(_FLASH_RED, "Unknown card -- please complete registration.")
             self._open_registration(card_id)
             return
 
-        sid = student["id"]
-        fname = student["first_name"]
-        lname = student["last_name"]
+        sid, fname, lname = student.id, student.first_name, student.last_name
 
         # Get ALL enrolled section IDs (not just today's)
         all_enrolled_ids = list(student_ctrl.get_enrolled_section_ids(sid))
@@ -8,6 +8,7 @@ Supports two modes:
 
 from __future__ import annotations
 
+import threading
 from datetime import date, datetime
 from tkinter import messagebox, filedialog
 from typing import Any, Optional
@@ -498,21 +499,43 @@ class ReportTab(ctk.CTkFrame):
         if not path:
             return
 
+        # Build the PDF in a background thread so the window keeps painting
+        self._pdf_btn.configure(state="disabled")
+        self._pdf_result: tuple = (False, "")
+        thread = threading.Thread(
+            target=self._bg_export_pdf, args=(self._last_mode, report, path), daemon=True
+        )
+        thread.start()
+        self._poll_pdf_thread(thread, path)
+
+    def _bg_export_pdf(self, mode: str, report: dict, path: str) -> None:
+        """Background thread target for the ReportLab build."""
         try:
-            if self._last_mode == "daily":
+            if mode == "daily":
                 report_ctrl.generate_daily_section_pdf(report, path)
             else:
                 report_ctrl.generate_full_section_pdf(report, path)
+            self._pdf_result = (True, "")
+        except Exception as exc:
+            log_error(f"PDF export failed: {exc}")
+            self._pdf_result = (False, str(exc))
 
+    def _poll_pdf_thread(self, thread: threading.Thread, path: str) -> None:
+        if thread.is_alive():
+            self.after(100, lambda: self._poll_pdf_thread(thread, path))
+            return
+
+        self._pdf_btn.configure(state="normal")
+        ok, err = self._pdf_result
+        if ok:
             messagebox.showinfo(
                 "PDF Exported",
                 f"Report saved to:\n{path}",
                 parent=self._app,
             )
             log_info(f"PDF exported: {path}")
-        except Exception as exc:
-            log_error(f"PDF export failed: {exc}")
-            messagebox.showerror("Error", f"Could not export PDF:\n{exc}", parent=self._app)
+        else:
+            messagebox.showerror("Error", f"Could not export PDF:\n{err}", parent=self._app)
 
     # ──────────────────────────────────────────────────────────────────────────
     # Helpers
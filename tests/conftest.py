@@ -14,6 +14,9 @@ if _SRC not in sys.path:
 
 from models.database import initialise_database, close_connection, _local, DB_PATH
 import models.database as _db_mod
+from models.student_model import invalidate_card_cache
+from models.section_model import invalidate_day_sections
+from models.settings_model import invalidate_settings_cache
 
 
 @pytest.fixture(autouse=True)
@@ -32,6 +35,11 @@ def fresh_database(tmp_path, monkeypatch):
             pass
         del _local.conn
 
+    # Cached lookups belong to the previous test's database.
+    invalidate_card_cache()
+    invalidate_day_sections()
+    invalidate_settings_cache()
+
     initialise_database()
     yield db_file
 
@@ -0,0 +1,397 @@
+"""Tests for the batched / single-transaction tap and report paths."""
+
+import sqlite3
+
+import pytest
+
+# ── Models ────────────────────────────────────────────────────────────────────
+from models import student_model, section_model, attendance_model, session_model
+from models.database import get_connection, transaction
+
+# ── Controllers ───────────────────────────────────────────────────────────────
+import controllers.attendance_controller as attendance_ctrl
+
+
+def _enrolled_student(day, *section_names, card="5555555555"):
+    """Create a student enrolled in one section per name, all on *day*."""
+    sid = student_model.create_student("Ada", "Lovelace", card)
+    sec_ids = []
+    for name in section_names:
+        sec = section_model.create_section(name, "Normal", "Beginner", day, "10:00")
+        student_model.assign_section(sid, sec)
+        sec_ids.append(sec)
+    return sid, sec_ids
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# transaction() — nested get_connection() calls join one outer transaction
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestTransaction:
+    def test_nested_model_calls_commit_once(self, fresh_database):
+        with transaction():
+            student_model.create_student("A", "B", "1111111111")
+            student_model.create_student("C", "D", "2222222222")
+            with get_connection() as conn:
+                assert conn.in_transaction
+        assert len(student_model.get_all_students()) == 2
+
+    def test_error_rolls_back_whole_block(self, fresh_database):
+        with pytest.raises(sqlite3.IntegrityError):
+            with transaction():
+                student_model.create_student("A", "B", "1111111111")
+                student_model.create_student("C", "D", "1111111111")
+        assert student_model.get_all_students() == []
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# mark_present_in_sections — batched session auto-create + upsert
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestMarkPresentInSections:
+    def test_creates_sessions_and_marks_all(self, fresh_database, today_weekday):
+        sid, secs = _enrolled_student(today_weekday, "S1", "S2")
+        marked, already = attendance_model.mark_present_in_sections(sid, secs, "2026-03-02")
+        assert marked == secs
+        assert already == []
+        for sec in secs:
+            assert session_model.get_existing_session_for_date(sec, "2026-03-02") is not None
+
+    def test_second_call_reports_already_present(self, fresh_database, today_weekday):
+        sid, secs = _enrolled_student(today_weekday, "S1", "S2")
+        attendance_model.mark_present_in_sections(sid, secs, "2026-03-02")
+        marked, already = attendance_model.mark_present_in_sections(sid, secs, "2026-03-02")
+        assert marked == []
+        assert already == secs
+
+    def test_absent_record_is_flipped_to_present(self, fresh_database, today_weekday):
+        sid, (sec,) = _enrolled_student(today_weekday, "S1")
+        sess = session_model.get_or_create_session(sec, "2026-03-02")
+        attendance_model.mark_absent(sess, sid)
+        marked, _ = attendance_model.mark_present_in_sections(sid, [sec], "2026-03-02")
+        assert marked == [sec]
+        record = attendance_model.get_attendance_record(sess, sid)
+        assert record["status"] == "Present"
+        assert record["method"] == "Manual"
+
+    def test_passive_tap_marks_every_section_today(self, fresh_database, today_weekday):
+        _enrolled_student(today_weekday, "Ballet", "Jazz")
+        result = attendance_ctrl.process_rfid_passive("5555555555")
+        assert result.result_type.name == "KNOWN_PRESENT"
+        assert sorted(result.sections_marked) == ["Ballet", "Jazz"]
+        assert result.attended == 2
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# get_daily_report — single aggregated query
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestDailyReport:
+    def test_counts_distinct_students_across_sections(self, fresh_database, today_weekday):
+        from datetime import date
+        today = date.today().isoformat()
+        s1, (ballet, jazz) = _enrolled_student(today_weekday, "Ballet", "Jazz")
+        s2 = student_model.create_student("Bob", "Jones", "6666666666")
+        student_model.assign_section(s2, ballet)
+        s3 = student_model.create_student("Cat", "Inactive", "7777777777")
+        student_model.assign_section(s3, ballet)
+        student_model.set_inactive_status(s3, True)
+
+        attendance_model.mark_present_in_sections(s1, [ballet], today)
+
+        report = attendance_ctrl.get_daily_report(today)
+        assert report["total_active"] == 2
+        assert report["present_count"] == 1
+        assert report["absent_count"] == 1
+        assert report["sections"] == [
+            {"name": "Ballet", "present": 1, "absent": 1, "total": 2},
+            {"name": "Jazz", "present": 0, "absent": 1, "total": 1},
+        ]
+
+    def test_no_sections_on_day(self, fresh_database):
+        report = attendance_ctrl.get_daily_report("2026-03-02")
+        assert report["total_active"] == 0
+        assert report["sections"] == []
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Card lookup cache — invalidated by student writes
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestCardCache:
+    def test_unknown_card_becomes_known_after_assignment(self, fresh_database):
+        assert student_model.get_cached_student_by_card_id("8888888888") is None
+        sid = student_model.create_student("New", "Student")
+        student_model.assign_card(sid, "8888888888")
+        cached = student_model.get_cached_student_by_card_id("8888888888")
+        assert cached == (sid, "New", "Student", False)
+
+    def test_inactive_flag_change_is_visible(self, fresh_database):
+        sid = student_model.create_student("A", "B", "1111111111")
+        student_model.get_cached_student_by_card_id("1111111111")
+        student_model.set_inactive_status(sid, True)
+        assert student_model.get_cached_student_by_card_id("1111111111")[3] is True
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# get_sections_for_students_on_day — roster-wide cache, invalidated on enrolment
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestDaySections:
+    def test_enrolment_changes_are_visible(self, fresh_database, today_weekday):
+        sid, (ballet,) = _enrolled_student(today_weekday, "Ballet")
+        day = today_weekday.upper()
+        assert section_model.get_sections_for_students_on_day(day) == {
+            sid: [(ballet, "Ballet")]
+        }
+        jazz = section_model.create_section("Jazz", "Normal", "Beginner", today_weekday, "11:00")
+        student_model.assign_section(sid, jazz)
+        student_model.remove_section(sid, ballet)
+        assert section_model.get_sections_for_students_on_day(day) == {
+            sid: [(jazz, "Jazz")]
+        }
+
+    def test_section_moved_to_other_day(self, fresh_database, today_weekday, other_weekday):
+        sid, (sec,) = _enrolled_student(today_weekday, "S1")
+        assert sid in section_model.get_sections_for_students_on_day(today_weekday)
+        section_model.update_section(sec, "S1", "Normal", "Beginner", other_weekday, "10:00")
+        assert section_model.get_sections_for_students_on_day(today_weekday) == {}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# get_setting — cached reads, dropped by set_setting
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestSettingsCache:
+    def test_write_is_visible_after_cached_read(self, fresh_database):
+        from models import settings_model
+        assert settings_model.get_setting("no_such_key") is None
+        settings_model.set_setting("no_such_key", "1")
+        assert settings_model.get_setting("no_such_key") == "1"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# refresh_inactive_status_all — single set-based UPDATE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestRefreshInactiveAll:
+    def test_matches_per_student_streaks(self, fresh_database, today_weekday):
+        from models import settings_model
+        settings_model.set_setting("inactive_threshold", "2")
+        sec = section_model.create_section("S1", "Normal", "Beginner", today_weekday, "10:00")
+        regular = student_model.create_student("Reg", "Ular", "1111111111")
+        dropout = student_model.create_student("Drop", "Out", "2222222222")
+        for sid in (regular, dropout):
+            student_model.assign_section(sid, sec)
+        for day in ("2026-01-05", "2026-01-12", "2026-01-19"):
+            sess = session_model.get_or_create_session(sec, day)
+            attendance_model.mark_present(sess, regular)
+        first = session_model.get_or_create_session(sec, "2026-01-05")
+        attendance_model.mark_present(first, dropout)
+
+        assert attendance_ctrl.refresh_inactive_status_all() == (1, 0)
+        assert not student_model.get_student_by_id(regular)["is_inactive"]
+        assert student_model.get_student_by_id(dropout)["is_inactive"]
+        assert attendance_model.get_consecutive_recent_absences(dropout) == 2
+
+        # Nothing changes on a second run
+        assert attendance_ctrl.refresh_inactive_status_all() == (0, 0)
+
+    def test_single_student_scope(self, fresh_database, today_weekday):
+        sec = section_model.create_section("S1", "Normal", "Beginner", today_weekday, "10:00")
+        regular = student_model.create_student("Reg", "Ular", "1111111111")
+        dropout = student_model.create_student("Drop", "Out", "2222222222")
+        for sid in (regular, dropout):
+            student_model.assign_section(sid, sec)
+        for day in ("2026-01-05", "2026-01-12"):
+            sess = session_model.get_or_create_session(sec, day)
+            attendance_model.mark_present(sess, regular)
+
+        assert attendance_model.apply_inactive_threshold(2, regular) == (0, 0)
+        assert not student_model.get_student_by_id(dropout)["is_inactive"]
+        assert attendance_model.apply_inactive_threshold(2, dropout) == (1, 0)
+        assert student_model.get_student_by_id(dropout)["is_inactive"]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# mark_present / process_card_tap — atomic insert-or-duplicate
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestAtomicMarkPresent:
+    def test_second_insert_returns_none(self, fresh_database, today_weekday):
+        sid, (sec,) = _enrolled_student(today_weekday, "S1")
+        sess = session_model.create_session(sec)
+        assert attendance_model.mark_present(sess, sid) is not None
+        assert attendance_model.mark_present(sess, sid) is None
+
+    def test_card_tap_reports_duplicate(self, fresh_database, today_weekday):
+        _sid, (sec,) = _enrolled_student(today_weekday, "S1")
+        sess = session_model.create_session(sec)
+        first = attendance_ctrl.process_card_tap("5555555555", sess)
+        second = attendance_ctrl.process_card_tap("5555555555", sess)
+        assert first.result_type.name == "KNOWN_PRESENT"
+        assert second.result_type.name == "DUPLICATE_TAP"
+
+    def test_card_tap_validates_card_before_session(self, fresh_database):
+        assert attendance_ctrl.process_card_tap("  ", None).result_type.name == "ERROR"
+        no_session = attendance_ctrl.process_card_tap(" 5555555555 ", None)
+        assert (no_session.result_type.name, no_session.card_id) == (
+            "NO_SESSION", "5555555555",
+        )
+
+    def test_set_status_atomic_outcomes(self, fresh_database, today_weekday):
+        sid, (sec,) = _enrolled_student(today_weekday, "S1")
+        sess = session_model.create_session(sec)
+        assert attendance_model.set_status_atomic(sess, sid, "Absent", "RFID") == "Absent"
+        assert attendance_model.set_status_atomic(sess, sid, "Absent") is None
+        assert attendance_model.set_status_atomic(sess, sid, "Present") == "Present"
+        assert attendance_model.set_status_atomic(sess, sid, "Present") is None
+        record = attendance_model.get_attendance_record(sess, sid)
+        assert (record["status"], record["method"]) == ("Present", "Manual")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# get_*_summary_rows — export-shaped tuples for the Sheets summary
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestSummaryExportRows:
+    def test_summary_figures(self, fresh_database, today_weekday):
+        sid, (ballet, jazz) = _enrolled_student(today_weekday, "Ballet", "Jazz")
+        no_card = student_model.create_student("Bob", "Jones")
+        student_model.assign_section(no_card, ballet)
+        for day in ("2026-01-05", "2026-01-12"):
+            attendance_model.mark_present_in_sections(sid, [ballet, jazz], day)
+            sess = session_model.get_or_create_session(ballet, day)
+            attendance_model.mark_absent(sess, no_card)
+
+        assert attendance_model.get_student_summary_rows() == [
+            (no_card, "Bob", "Jones", "", "0/2"),
+            (sid, "Ada", "Lovelace", "5555555555", "4/4"),
+        ]
+        assert attendance_model.get_section_summary_rows() == [
+            (no_card, "Ballet", "0/2"),
+            (sid, "Ballet", "2/2"),
+            (sid, "Jazz", "2/2"),
+        ]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# get_student_attendance_overview — one joined query for all sections
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestAttendanceOverview:
+    def test_session_and_status_per_section(self, fresh_database, today_weekday):
+        sid, (ballet, jazz, tap) = _enrolled_student(today_weekday, "Ballet", "Jazz", "Tap")
+        attendance_model.mark_present_in_sections(sid, [ballet], "2026-03-02")
+        jazz_sess = session_model.get_or_create_session(jazz, "2026-03-02")
+        attendance_model.mark_absent(jazz_sess, sid)
+        session_model.get_or_create_session(tap, "2026-03-09")   # other date
+
+        overview = attendance_ctrl.get_student_attendance_overview(sid, "2026-03-02")
+        assert [(r["section_name"], r["status"]) for r in overview] == [
+            ("Ballet", "Present"), ("Jazz", "Absent"), ("Tap", None),
+        ]
+        assert overview[1]["session_id"] == jazz_sess
+        assert overview[2]["session_id"] is None
+        assert overview[0]["time"] == "10:00"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# import_controller._parse_sheet_values — positional parse of the raw cell grid
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestImportParse:
+    def test_counts_and_threshold(self):
+        from controllers.import_controller import _parse_sheet_values
+        values = [
+            [" Name ", "RFID", "D_2026_01_05", "D_2026_01_12", "notes"],
+            ["Ada Lovelace", " 0012345678 ", "1", "x", ""],
+            ["Bob", "", "0", "", "hi"],
+            ["", "", "1", "1", ""],
+        ]
+        students, session_count = _parse_sheet_values(values, threshold=2)
+        assert session_count == 2
+        assert [(s.first_name, s.last_name, s.card_id, s.attendance_count, s.include)
+                for s in students] == [
+            ("Ada", "Lovelace", "0012345678", 2, True),
+            ("Bob", "", None, 0, False),
+        ]
+
+    def test_full_name_whitespace_is_stripped(self):
+        from controllers.import_controller import _parse_sheet_values
+        values = [["name", "rfid"], ["  Ada   Lovelace \t", " 1 "], ["Bob ", ""]]
+        students, _count = _parse_sheet_values(values, threshold=0)
+        assert [(s.first_name, s.last_name, s.card_id) for s in students] == [
+            ("Ada", "Lovelace", "1"), ("Bob", "", None),
+        ]
+
+    def test_sheet_title_from_range(self):
+        from controllers.import_controller import _sheet_title_from_range
+        assert _sheet_title_from_range("Sheet1!A1:C9") == "Sheet1"
+        assert _sheet_title_from_range("'Ada''s list'!A1:C9") == "Ada's list"
+
+    def test_missing_name_column(self):
+        from controllers.import_controller import _parse_sheet_values
+        with pytest.raises(ValueError):
+            _parse_sheet_values([["rfid"], ["1"]], threshold=0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# import_controller._drive_modified_time — only 403/404 turn Drive off
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class _DriveError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.response = type("Response", (), {"status_code": status})()
+
+
+class _FakeDrive:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def get_file_drive_metadata(self, _spreadsheet_id):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return {"modifiedTime": outcome}
+
+
+class TestDriveModifiedTime:
+    def test_transient_error_keeps_drive_enabled(self, monkeypatch):
+        import controllers.import_controller as import_ctrl
+        monkeypatch.setattr(import_ctrl, "_drive_unavailable", False)
+        drive = _FakeDrive(_DriveError(503), "2026-01-05T10:00:00Z")
+        assert import_ctrl._drive_modified_time(drive, "id") is None
+        assert import_ctrl._drive_modified_time(drive, "id") == "2026-01-05T10:00:00Z"
+
+    def test_forbidden_disables_drive(self, monkeypatch):
+        import controllers.import_controller as import_ctrl
+        monkeypatch.setattr(import_ctrl, "_drive_unavailable", False)
+        drive = _FakeDrive(_DriveError(403), "2026-01-05T10:00:00Z")
+        assert import_ctrl._drive_modified_time(drive, "id") is None
+        assert import_ctrl._drive_modified_time(drive, "id") is None
+        assert drive.calls == 1
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# import_controller.commit_import — filter in Python, one executemany insert
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestCommitImport:
+    def test_skips_known_names_and_cards(self, fresh_database):
+        from controllers.import_controller import ImportPreview, ImportStudentRow, commit_import
+        student_model.create_student("Ada", "Lovelace", "1111111111")
+        rows = [
+            ImportStudentRow("ADA", "lovelace", None, 3, True),         # name exists
+            ImportStudentRow("Bob", "Jones", "1111111111", 3, True),    # card taken
+            ImportStudentRow("Cat", "Smith", "2222222222", 3, True),
+            ImportStudentRow("Cat", "Smith", None, 3, True),            # same batch
+            ImportStudentRow("Dan", "Brown", None, 0, False),           # excluded
+        ]
+        preview = ImportPreview("Sheet1", 5, 3, 2, 3, 4, 1, students=rows)
+        assert commit_import(preview) == (1, 3, "")
+        assert student_model.get_cached_student_by_card_id("2222222222").first_name == "Cat"
+        assert len(student_model.get_all_students()) == 2